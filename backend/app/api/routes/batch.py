@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from app.db.database import get_supabase
+from app.db.models import BatchRequest, BatchResponse
+from app.services.batch_ops import run_batch
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch_operations(request: BatchRequest):
+    """
+    Apply many card/board operations in one request.
+    Operations are validated together and merged into bulk statements.
+    With atomic=true nothing is kept unless every operation succeeds.
+    """
+    supabase = get_supabase()
+    return run_batch(supabase, request.operations, request.atomic)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from app.db.database import get_supabase
-from app.db.models import Board, BoardCreate, BoardUpdate
+from app.db.models import Board, BoardCreate, BoardUpdate, BoardArchiveRequest, BoardArchiveResponse
+from app.services.batch_ops import set_boards_active
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/boards", tags=["boards"])
@@ -63,25 +64,36 @@ async def update_board(board_id: str, board: BoardUpdate):
     return response.data[0]
 
 
+@router.post("/archive", response_model=BoardArchiveResponse)
+async def archive_boards(request: BoardArchiveRequest):
+    """Soft delete several boards and all their cards in one transaction."""
+    supabase = get_supabase()
+    return set_boards_active(supabase, request.board_ids, False)
+
+
+@router.post("/restore", response_model=BoardArchiveResponse)
+async def restore_boards(request: BoardArchiveRequest):
+    """Restore several soft-deleted boards and all their cards in one transaction."""
+    supabase = get_supabase()
+    return set_boards_active(supabase, request.board_ids, True)
+
+
 @router.delete("/{board_id}")
 async def delete_board(board_id: str):
     """Soft delete a board and all its cards (mark as inactive)."""
     supabase = get_supabase()
-    now = datetime.now(timezone.utc).isoformat()
-    supabase.table("cards").update({"is_active": False, "updated_at": now}).eq("board_id", board_id).execute()
-    response = supabase.table("boards").update({"is_active": False, "updated_at": now}).eq("id", board_id).execute()
-    if not response.data:
+    result = set_boards_active(supabase, [board_id], False)
+    if not result["boards_updated"]:
         raise HTTPException(status_code=404, detail="Board not found")
-    return {"message": "Board archived successfully"}
+    return {"message": "Board archived successfully", **result}
 
 
 @router.post("/{board_id}/restore", response_model=Board)
 async def restore_board(board_id: str):
     """Restore a soft-deleted board and all its cards."""
     supabase = get_supabase()
-    now = datetime.now(timezone.utc).isoformat()
-    supabase.table("cards").update({"is_active": True, "updated_at": now}).eq("board_id", board_id).execute()
-    response = supabase.table("boards").update({"is_active": True, "updated_at": now}).eq("id", board_id).execute()
-    if not response.data:
+    result = set_boards_active(supabase, [board_id], True)
+    if not result["boards_updated"]:
         raise HTTPException(status_code=404, detail="Board not found")
+    response = supabase.table("boards").select("*").eq("id", board_id).execute()
     return response.data[0]
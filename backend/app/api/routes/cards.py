@@ -1,7 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from app.db.database import get_supabase
-from app.db.models import Card, CardCreate, CardUpdate, CardMove
+from app.db.models import (
+    Card, CardCreate, CardUpdate, CardMove, CardStatus, CardSearchResponse, DueCardsResponse, HistoryCompactionResult,
+    PriorityHistoryPage,
+)
+from app.services import card_events, priority_history
+from app.services.card_search import get_search_index
+from app.services.deadlines import get_deadline_index, parse_window
+from app.services.fast_json import ALL_BOARDS, CARD_COLUMNS, get_response_cache, json_response, render_cards
+from app.services.write_journal import get_write_journal
 from datetime import datetime, timezone
+import asyncio
+import json
+import uuid
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
@@ -9,24 +22,109 @@ router = APIRouter(prefix="/cards", tags=["cards"])
 @router.get("/board/{board_id}", response_model=list[Card])
 async def list_cards_by_board(board_id: str):
     """List all active cards in a specific board."""
+    cache = get_response_cache()
+    if cache and (body := cache.get(board_id)):
+        return json_response(body)
+    version = cache.version(board_id) if cache else 0
     supabase = get_supabase()
     response = (
         supabase.table("cards")
-        .select("*")
+        .select(CARD_COLUMNS)
         .eq("board_id", board_id)
         .eq("is_active", True)
         .order("position")
         .execute()
     )
-    return response.data
+    rows = response.data
+    journal = get_write_journal()
+    if journal:  # Include edits still waiting to sync
+        rows = journal.overlay(rows, lambda c: c["board_id"] == board_id and card_events.is_active_card(c), order_by="position")
+    # Rows are our own, so skip per-row model validation (response_model is kept for the docs)
+    body = render_cards(rows)
+    if cache:
+        cache.store(board_id, version, rows, body)
+    return json_response(body)
 
 
 @router.get("", response_model=list[Card])
 async def list_all_cards():
     """List all active cards across all boards."""
+    cache = get_response_cache()
+    if cache and (body := cache.get(ALL_BOARDS)):
+        return json_response(body)
+    version = cache.version(ALL_BOARDS) if cache else 0
     supabase = get_supabase()
-    response = supabase.table("cards").select("*").eq("is_active", True).order("priority").execute()
-    return response.data
+    response = supabase.table("cards").select(CARD_COLUMNS).eq("is_active", True).order("priority").execute()
+    rows = response.data
+    journal = get_write_journal()
+    if journal:
+        rows = journal.overlay(rows, card_events.is_active_card, order_by="priority")
+    body = render_cards(rows)
+    if cache:
+        cache.store(ALL_BOARDS, version, rows, body)
+    return json_response(body)
+
+
+@router.get("/search", response_model=CardSearchResponse)
+async def search_cards(
+    q: str = "",
+    tags: list[str] = Query(default=[]),
+    status: list[CardStatus] = Query(default=[]),
+    priority: list[int] = Query(default=[]),
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    board_id: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=200),
+):
+    """Ranked full-text search over active card titles/descriptions with tag, status, priority and deadline filters."""
+    index = get_search_index()
+    await asyncio.to_thread(index.ensure_loaded, get_supabase())  # A cold load fetches every card
+    total, hits = index.search(
+        q, tags=tags, statuses=[s.value for s in status], priorities=priority,
+        deadline_from=deadline_from, deadline_to=deadline_to, board_id=board_id, limit=limit,
+    )
+    return {"total": total, "hits": [{"score": score, "card": card} for score, card in hits]}
+
+
+@router.get("/due", response_model=DueCardsResponse)
+async def list_due_cards(
+    within: str = "24h",
+    include_overdue: bool = True,
+    limit: int = Query(default=100, ge=1, le=500),
+):
+    """Open cards due within the window (e.g. 90m, 12h, 3d, 1w), soonest first, overdue cards included by default."""
+    try:
+        window = parse_window(within)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    index = get_deadline_index()
+    await asyncio.to_thread(index.ensure_loaded, get_supabase())
+    now = datetime.now(timezone.utc)
+    cards = index.due(now + window, after=None if include_overdue else now, limit=limit)
+    return {"now": now, "until": now + window, "cards": cards}
+
+
+@router.get("/due/events")
+async def stream_deadline_events():
+    """Server-sent events: `due_soon` and `overdue`, pushed when each card's moment arrives."""
+    queue: asyncio.Queue = asyncio.Queue()
+    unsubscribe = get_deadline_index().subscribe(queue.put_nowait)
+
+    async def events():
+        try:
+            while True:
+                event = await queue.get()
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post("/priority-history/compact", response_model=HistoryCompactionResult)
+async def compact_priority_history(retain_days: Optional[int] = Query(default=None, ge=1)):
+    """Run priority history compaction now (it also runs daily). Defaults to the configured retention."""
+    return priority_history.compact(get_supabase(), retain_days)
 
 
 @router.post("", response_model=Card)
@@ -41,10 +139,27 @@ async def create_card(card: CardCreate):
     card_data["updated_at"] = now
     card_data["deadline"] = card_data["deadline"].isoformat() if card_data["deadline"] else None
 
-    response = supabase.table("cards").insert(card_data).execute()
-    if not response.data:
-        raise HTTPException(status_code=400, detail="Failed to create card")
-    return response.data[0]
+    # Flag (but still create) cards that look like an existing card on the same board
+    from app.services.duplicates import get_duplicate_detector  # Loads numpy on first create, not at startup
+    # The first create on a board loads its cards; do that off the event loop
+    try:
+        match = (await asyncio.to_thread(get_duplicate_detector().find_duplicates, supabase, card.board_id, [card_data]))[0]
+    except Exception:  # The flag is a hint; never let it block the write (e.g. offline on the first board load)
+        match = None
+    if match:
+        card_data["metadata"] = {**(card_data["metadata"] or {}), "possible_duplicate_of": match["card_id"], "duplicate_score": match["score"]}
+
+    journal = get_write_journal()
+    if journal:  # Acknowledge now, sync in the background
+        card_data.update(id=str(uuid.uuid4()), is_active=True)
+        created = journal.insert(card_data)
+    else:
+        response = supabase.table("cards").insert(card_data).execute()
+        if not response.data:
+            raise HTTPException(status_code=400, detail="Failed to create card")
+        created = response.data[0]
+    card_events.cards_changed([created])
+    return created
 
 
 @router.get("/{card_id}", response_model=Card)
@@ -52,9 +167,45 @@ async def get_card(card_id: str):
     """Get a specific card by ID."""
     supabase = get_supabase()
     response = supabase.table("cards").select("*").eq("id", card_id).execute()
-    if not response.data:
+    rows = response.data
+    journal = get_write_journal()
+    if journal:
+        rows = journal.overlay(rows, lambda c: c["id"] == card_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Card not found")
+    return rows[0]
+
+
+@router.get("/{card_id}/priority-history", response_model=PriorityHistoryPage)
+async def get_priority_history(card_id: str, limit: int = Query(default=50, ge=1, le=200), before: Optional[str] = None):
+    """A card's priority changes, newest first. Follow next_cursor with ?before= for older pages."""
+    try:
+        return priority_history.history_page(get_supabase(), card_id, limit, before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _write_card(supabase, card_id: str, update_data: dict) -> dict:
+    """Apply an update to one card, through the write journal when enabled. Raises 404 if the card is unknown."""
+    journal = get_write_journal()
+    if journal:
+        row = journal.update(card_id, update_data)
+        if row is None:  # Queued, but this session never read the card; load it off the event loop for the response
+            try:
+                response = await asyncio.to_thread(supabase.table("cards").select("*").eq("id", card_id).execute)
+            except Exception as e:
+                raise HTTPException(status_code=503, detail=f"Edit queued, but the card could not be loaded: {e}")
+            if not response.data:
+                journal.discard(card_id)
+            journal.remember(response.data)
+            row = journal.merged(card_id)
+    else:
+        response = supabase.table("cards").update(update_data).eq("id", card_id).execute()
+        row = response.data[0] if response.data else None
+    if row is None:
         raise HTTPException(status_code=404, detail="Card not found")
-    return response.data[0]
+    card_events.cards_changed([row])
+    return row
 
 
 @router.put("/{card_id}", response_model=Card)
@@ -68,10 +219,7 @@ async def update_card(card_id: str, card: CardUpdate):
     if "deadline" in update_data and update_data["deadline"]:
         update_data["deadline"] = update_data["deadline"].isoformat()
 
-    response = supabase.table("cards").update(update_data).eq("id", card_id).execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Card not found")
-    return response.data[0]
+    return await _write_card(supabase, card_id, update_data)
 
 
 @router.delete("/{card_id}")
@@ -79,9 +227,7 @@ async def delete_card(card_id: str):
     """Soft delete a card (mark as inactive)."""
     supabase = get_supabase()
     now = datetime.now(timezone.utc).isoformat()
-    response = supabase.table("cards").update({"is_active": False, "updated_at": now}).eq("id", card_id).execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Card not found")
+    await _write_card(supabase, card_id, {"is_active": False, "updated_at": now})
     return {"message": "Card archived successfully"}
 
 
@@ -92,10 +238,7 @@ async def move_card(card_id: str, move: CardMove):
     update_data = move.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
-    response = supabase.table("cards").update(update_data).eq("id", card_id).execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Card not found")
-    return response.data[0]
+    return await _write_card(supabase, card_id, update_data)
 
 
 @router.post("/reorder")
@@ -107,13 +250,25 @@ async def reorder_cards(card_positions: list[dict]):
     supabase = get_supabase()
     now = datetime.now(timezone.utc).isoformat()
 
+    journal = get_write_journal()
+    if journal:  # One journal append for the whole drag; replayed as a coalesced batch
+        changes = {
+            card_pos["id"]: {"position": card_pos["position"], "status": card_pos.get("status"), "updated_at": now}
+            for card_pos in card_positions
+        }
+        card_events.cards_changed(list(journal.update_many(changes).values()))
+        return {"message": "Cards reordered successfully"}
+
+    updated = []
     for card_pos in card_positions:
-        supabase.table("cards").update(
+        response = supabase.table("cards").update(
             {
                 "position": card_pos["position"],
                 "status": card_pos.get("status"),
                 "updated_at": now,
             }
         ).eq("id", card_pos["id"]).execute()
+        updated += response.data
 
+    card_events.cards_changed(updated)
     return {"message": "Cards reordered successfully"}
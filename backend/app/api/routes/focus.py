@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Query
+from app.db.database import get_supabase
+from app.db.models import FocusResponse
+from app.services.focus import MAX_K, get_focus_queue, reasons
+from datetime import datetime, timezone
+import asyncio
+
+router = APIRouter(prefix="/focus", tags=["focus"])
+
+
+@router.get("", response_model=FocusResponse)
+async def get_focus(k: int = Query(default=10, ge=1, le=MAX_K)):
+    """
+    The k open cards to work on next, across all boards.
+    Ranked by deadline proximity, AI priority and in-progress status combined.
+    """
+    queue = get_focus_queue()
+    await asyncio.to_thread(queue.ensure_loaded, get_supabase())  # A cold load fetches every card
+    total, head = queue.top(k)
+    now = datetime.now(timezone.utc)
+    return {"total": total, "items": [{**item, "reasons": reasons(item["card"], now)} for item in head]}
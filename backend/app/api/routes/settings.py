@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from pathlib import Path
+from typing import Literal
 import os
 
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -11,17 +12,19 @@ class SettingsRequest(BaseModel): # API keys from frontend
     supabase_url: str = ""
     supabase_key: str = ""
     openai_api_key: str = ""
+    storage_backend: Literal["supabase", "sqlite"] = "supabase"
 
 class SettingsResponse(BaseModel):
     supabase_url: str = ""
     supabase_key: str = ""
     openai_api_key: str = ""
+    storage_backend: str = "supabase"
     saved: bool = False
 
 @router.get("", response_model=SettingsResponse)
 async def get_settings():
     """Load settings from ~/.canban-ai/.env"""
-    settings = {"supabase_url": "", "supabase_key": "", "openai_api_key": "", "saved": False}
+    settings = {"supabase_url": "", "supabase_key": "", "openai_api_key": "", "storage_backend": "supabase", "saved": False}
     if CONFIG_FILE.exists():
         try:
             with open(CONFIG_FILE, "r") as f:
@@ -34,6 +37,7 @@ async def get_settings():
                         if key == "supabase_url": settings["supabase_url"] = val
                         elif key == "supabase_key": settings["supabase_key"] = val
                         elif key == "openai_api_key": settings["openai_api_key"] = val
+                        elif key == "storage_backend": settings["storage_backend"] = val
             settings["saved"] = True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to read config: {e}")
@@ -48,10 +52,11 @@ async def save_settings(request: SettingsRequest):
 SUPABASE_URL={request.supabase_url}
 SUPABASE_KEY={request.supabase_key}
 OPENAI_API_KEY={request.openai_api_key}
+STORAGE_BACKEND={request.storage_backend}
 """
         with open(CONFIG_FILE, "w") as f:
             f.write(env_content)
-        return SettingsResponse(supabase_url=request.supabase_url, supabase_key=request.supabase_key, openai_api_key=request.openai_api_key, saved=True)
+        return SettingsResponse(supabase_url=request.supabase_url, supabase_key=request.supabase_key, openai_api_key=request.openai_api_key, storage_backend=request.storage_backend, saved=True)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save config: {e}")
 
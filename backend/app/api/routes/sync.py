@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException
+from app.db.models import SyncStatus
+from app.services.write_journal import get_write_journal
+import asyncio
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+def _status(journal) -> dict:
+    if journal is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "pending": journal.pending_count(),
+        "last_synced_at": journal.last_synced_at,
+        "last_error": journal.last_error,
+        "conflicts": journal.conflicts(),
+    }
+
+
+@router.get("/status", response_model=SyncStatus)
+async def sync_status():
+    """Pending card writes in the local journal and recent sync conflicts."""
+    return _status(get_write_journal())
+
+
+@router.post("/flush", response_model=SyncStatus)
+async def flush_journal():
+    """Push every pending card write to Supabase now instead of waiting for the background replayer."""
+    journal = get_write_journal()
+    if journal:
+        try:
+            await asyncio.to_thread(journal.drain)
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Sync failed, writes stay queued: {e}")
+    return _status(journal)
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.db.database import get_supabase
+from app.db.models import ImportResponse
+from app.services import card_events
+from app.services.transfer import EXPORT_TABLES, FORMAT, NdjsonImporter, buffered, export_lines, gzip_chunks, iter_ndjson
+from datetime import datetime, timezone
+import asyncio
+
+router = APIRouter(tags=["transfer"])
+
+
+@router.get("/export")
+async def export_workspace(
+    gzip: bool = False,
+    tables: list[str] = Query(default=list(EXPORT_TABLES)),
+):
+    """Stream boards, cards, priority history and activity logs as NDJSON (optionally gzip-compressed)."""
+    unknown = set(tables) - set(EXPORT_TABLES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(sorted(unknown))}")
+    supabase = get_supabase()
+    ordered = [t for t in EXPORT_TABLES if t in tables]
+    chunks = buffered(export_lines(supabase, ordered))
+    filename = f"canban-export-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.ndjson"
+    if gzip:
+        chunks, filename = gzip_chunks(chunks), filename + ".gz"
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/import", response_model=ImportResponse)
+async def import_workspace(request: Request):
+    """
+    Import an /export stream (plain or gzip NDJSON) as new rows.
+    Rows get fresh ids and foreign keys are remapped, so importing never overwrites existing data.
+    """
+    supabase = get_supabase()
+    importer = NdjsonImporter(supabase)
+    header_seen = False
+    records = []
+    try:
+        async for record in iter_ndjson(request.stream()):
+            if not header_seen:
+                if record.get("format") != FORMAT:
+                    raise ValueError("Not a CanBan.AI export (missing header line)")
+                header_seen = True
+                continue
+            records.append(record)
+            if len(records) >= importer.batch_size:  # Inserts block, so run them off the event loop
+                await asyncio.to_thread(importer.add_many, records)
+                records = []
+        if not header_seen:
+            raise ValueError("Empty import")
+        await asyncio.to_thread(importer.add_many, records)
+        result = await asyncio.to_thread(importer.finish)
+    except Exception as e:
+        # Earlier batches are already written; report them so the caller knows what landed
+        status = 400 if isinstance(e, ValueError) else 500
+        raise HTTPException(status_code=status, detail={"message": str(e), "imported": importer.imported, "skipped": importer.skipped})
+    finally:
+        card_events.cards_invalidated()
+    return result
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_key: str = ""
     openai_api_key: str = ""
+    storage_backend: str = "supabase"  # "supabase" or "sqlite" (embedded, offline)
+    sqlite_path: str = ""  # Defaults to ~/.canban-ai/canban.db
+    write_journal: bool = True  # Acknowledge card writes locally and sync to Supabase in the background
+    journal_path: str = ""  # Defaults to ~/.canban-ai/journal.db
+    priority_history_retain_days: int = 30  # Older priority history is compacted to one net change per card per day
+    due_soon_hours: float = 24  # How long before a deadline the due-soon alert fires
+    response_cache: bool = False  # Keep encoded card lists per board version; only safe if nothing else writes to the database
     debug: bool = True
     app_name: str = "CanBan.AI"
     class Config:
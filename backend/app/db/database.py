@@ -1,13 +1,29 @@
-from typing import Optional
-from supabase import create_client, Client
+from typing import Optional, Union, TYPE_CHECKING
+from pathlib import Path
 from app.core.config import get_settings
+import threading
 
-_supabase_client: Optional[Client] = None
+if TYPE_CHECKING:
+    from supabase import Client
+    from app.db.sqlite_backend import SQLiteClient
 
+DEFAULT_SQLITE_PATH = Path.home() / ".canban-ai" / "canban.db"
 
-def get_supabase() -> Client:
+_supabase_client: Optional[Union["Client", "SQLiteClient"]] = None
+_client_lock = threading.Lock()  # Startup warm-up may build the client while the first request asks for it
+
+
+def get_supabase() -> Union["Client", "SQLiteClient"]:
+    """Return the storage client for the configured backend (remote Supabase or embedded SQLite)."""
     global _supabase_client
     if _supabase_client is None:
-        settings = get_settings()
-        _supabase_client = create_client(settings.supabase_url, settings.supabase_key)
+        with _client_lock:
+            if _supabase_client is None:
+                settings = get_settings()
+                if settings.storage_backend == "sqlite":
+                    from app.db.sqlite_backend import SQLiteClient
+                    _supabase_client = SQLiteClient(settings.sqlite_path or str(DEFAULT_SQLITE_PATH))
+                else:
+                    from supabase import create_client  # Heavy import, deferred until the first query
+                    _supabase_client = create_client(settings.supabase_url, settings.supabase_key)
     return _supabase_client
@@ -29,6 +29,15 @@ class BoardUpdate(BaseModel):
     position: Optional[int] = None
 
 
+class BoardArchiveRequest(BaseModel):
+    board_ids: list[str] = Field(min_length=1)
+
+
+class BoardArchiveResponse(BaseModel):
+    boards_updated: int
+    cards_updated: int
+
+
 class Board(BoardBase):
     id: str
     created_at: datetime
@@ -82,12 +91,101 @@ class Card(CardBase):
         from_attributes = True
 
 
+class CardSearchHit(BaseModel):
+    score: float  # Text relevance; 0 when searching by filters only
+    card: Card
+
+
+class CardSearchResponse(BaseModel):
+    total: int
+    hits: list[CardSearchHit]
+
+
+class DueCardsResponse(BaseModel):
+    now: datetime
+    until: datetime
+    cards: list[Card]  # Soonest deadline first; overdue cards come first
+
+
+class FocusItem(BaseModel):
+    card: Card
+    effective_due: Optional[datetime] = None  # Deadline pulled earlier by priority and in-progress status; None without a deadline
+    reasons: list[str]
+
+
+class FocusResponse(BaseModel):
+    total: int  # Open cards across all boards
+    items: list[FocusItem]
+
+
 class CardMove(BaseModel):
     status: Optional[CardStatus] = None
     position: Optional[int] = None
     board_id: Optional[str] = None
 
 
+# Batch Models
+class BatchOpType(str, Enum):
+    UPDATE_CARD = "update_card"
+    MOVE_CARD = "move_card"
+    DELETE_CARD = "delete_card"
+    RESTORE_CARD = "restore_card"
+    UPDATE_BOARD = "update_board"
+    DELETE_BOARD = "delete_board"
+    RESTORE_BOARD = "restore_board"
+
+
+class BatchOperation(BaseModel):
+    op: BatchOpType
+    id: str
+    data: dict = {}  # Payload for update_*/move_* ops, same fields as CardUpdate/CardMove/BoardUpdate
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(min_length=1, max_length=500)
+    atomic: bool = False  # All-or-nothing: abort (and roll back) on any failure
+
+
+class BatchOperationResult(BaseModel):
+    index: int
+    op: BatchOpType
+    id: str
+    ok: bool
+    error: Optional[str] = None
+    data: Optional[dict] = None  # Row after all operations on this id were applied
+
+
+class BatchResponse(BaseModel):
+    applied: int
+    failed: int
+    statements: int  # DB statements issued for the whole batch
+    results: list[BatchOperationResult]
+
+
+# Export/Import Models
+class ImportResponse(BaseModel):
+    imported: dict[str, int]  # Rows written per table
+    skipped: dict[str, int]  # Rows dropped because their parent row was not in the import
+    statements: int
+
+
+# Write Journal Models
+class SyncConflict(BaseModel):
+    card_id: str
+    kind: str  # overwritten (ours won), server_newer (ours dropped), missing, rejected: <reason>
+    payload: Optional[dict] = None
+    server_updated_at: Optional[str] = None
+    detected_at: str
+
+
+class SyncStatus(BaseModel):
+    enabled: bool
+    pending: int = 0  # Journal entries not yet written to Supabase
+    last_synced_at: Optional[str] = None
+    last_error: Optional[str] = None
+    conflicts: list[SyncConflict] = []
+
+
 # Activity Log Models
 class ActivityType(str, Enum):
     SCREEN_TIME = "screen_time"
@@ -125,6 +223,18 @@ class PriorityHistory(BaseModel):
         from_attributes = True
 
 
+class PriorityHistoryPage(BaseModel):
+    items: list[PriorityHistory]  # Newest first
+    next_cursor: Optional[str] = None  # Pass as ?before= for the next (older) page
+
+
+class HistoryCompactionResult(BaseModel):
+    retain_days: int
+    rows_updated: int  # Kept rows rewritten to carry their day's net change
+    rows_deleted: int
+    compacted_before: Optional[datetime] = None  # Everything older than this is compacted
+
+
 # AI Models
 class AIPrioritizeRequest(BaseModel):
     board_id: Optional[str] = None  # If None, prioritize all boards
@@ -154,6 +264,11 @@ class ExtractedTask(BaseModel): # Single extracted task from AI
     board_id: Optional[str] = None
     status: str = "todo"
     position: int = 0
+    duplicate_of: Optional[str] = None  # Existing card this task most likely repeats
+    duplicate_of_index: Optional[int] = None  # Earlier task in the same paste this one repeats
+    duplicate_title: Optional[str] = None
+    duplicate_score: Optional[float] = None
+    keep_duplicate: bool = False  # User reviewed the match and wants the card anyway
 
 
 class ExtractTasksRequest(BaseModel): # Request to extract tasks from text
@@ -173,6 +288,7 @@ class CreateExtractedTasksRequest(BaseModel): # Request to create extracted task
 class CreateExtractedTasksResponse(BaseModel): # Response after creating tasks
     created_count: int
     cards: list[dict]
+    skipped_duplicates: list[dict] = []  # Tasks not created because they repeat an existing card or another task (unless kept)
 
 
 class DailyBriefing(BaseModel):
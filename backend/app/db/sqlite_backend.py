@@ -0,0 +1,479 @@
+"""
+Embedded SQLite storage that answers the subset of the Supabase/PostgREST
+query-builder API used by the routes and services, so they run unchanged on
+either backend. Selected with STORAGE_BACKEND=sqlite (see Settings).
+"""
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import json
+import re
+import sqlite3
+import threading
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    color TEXT DEFAULT '#6366f1',
+    position INTEGER DEFAULT 0,
+    is_active INTEGER DEFAULT 1,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    board_id TEXT REFERENCES boards(id) ON DELETE CASCADE,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'todo' CHECK (status IN ('todo', 'in_progress', 'done')),
+    priority INTEGER DEFAULT 3 CHECK (priority >= 1 AND priority <= 5),
+    priority_reason TEXT,
+    estimated_hours REAL,
+    actual_hours REAL,
+    deadline TEXT,
+    position INTEGER DEFAULT 0,
+    tags TEXT DEFAULT '[]',
+    metadata TEXT DEFAULT '{}',
+    is_active INTEGER DEFAULT 1,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS activity_logs (
+    id TEXT PRIMARY KEY,
+    card_id TEXT REFERENCES cards(id) ON DELETE CASCADE,
+    activity_type TEXT CHECK (activity_type IN ('screen_time', 'status_change', 'edit', 'priority_change')),
+    duration_minutes INTEGER,
+    context TEXT,
+    timestamp TEXT
+);
+
+CREATE TABLE IF NOT EXISTS priority_history (
+    id TEXT PRIMARY KEY,
+    card_id TEXT REFERENCES cards(id) ON DELETE CASCADE,
+    old_priority INTEGER,
+    new_priority INTEGER NOT NULL,
+    reasoning TEXT,
+    model_used TEXT,
+    timestamp TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_boards_is_active ON boards(is_active);
+CREATE INDEX IF NOT EXISTS idx_cards_is_active ON cards(is_active);
+CREATE INDEX IF NOT EXISTS idx_cards_board_id ON cards(board_id);
+CREATE INDEX IF NOT EXISTS idx_cards_status ON cards(status);
+CREATE INDEX IF NOT EXISTS idx_cards_priority ON cards(priority);
+CREATE INDEX IF NOT EXISTS idx_cards_deadline ON cards(deadline);
+CREATE INDEX IF NOT EXISTS idx_activity_logs_card_id ON activity_logs(card_id);
+CREATE INDEX IF NOT EXISTS idx_priority_history_card_id ON priority_history(card_id, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_priority_history_timestamp ON priority_history(timestamp);
+-- SQLite has no planner statistics on a fresh file and would otherwise pick idx_cards_is_active
+-- for the per-board listing; this covers the list_cards_by_board filter and sort in one index.
+CREATE INDEX IF NOT EXISTS idx_cards_board_active_position ON cards(board_id, is_active, position);
+-- Keyset scans over all active cards (in-process index loads) walk this in id order without sorting
+CREATE INDEX IF NOT EXISTS idx_cards_active_id ON cards(is_active, id);
+"""
+
+JSON_COLUMNS = {"tags", "metadata"}
+BOOL_COLUMNS = {"is_active"}
+TIMESTAMP_COLUMNS = {"created_at", "updated_at", "deadline", "timestamp"}
+TIMESTAMP_DEFAULTS = {  # Columns Postgres fills with NOW() when omitted
+    "boards": ("created_at", "updated_at"),
+    "cards": ("created_at", "updated_at"),
+    "activity_logs": ("timestamp",),
+    "priority_history": ("timestamp",),
+}
+EMBEDS = {("cards", "boards"): "board_id"}  # (table, embedded table) -> foreign key column
+MAX_VARIABLES = 900  # Stay under SQLite's bound-parameter limit on old builds
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_EMBED_RE = re.compile(r"(\w+)\(([^)]*)\)")
+
+
+def _ident(name: str) -> str:
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+
+def _normalize_timestamp(value):
+    if isinstance(value, str) and value.endswith("+00:00"):  # Already UTC ISO, as written by the routes
+        return value
+    if not isinstance(value, (str, datetime)):
+        return value
+    try:
+        parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _to_bool(value) -> int:
+    return int(value in (True, "true", 1))
+
+
+_CONVERTERS = {
+    **{c: json.dumps for c in JSON_COLUMNS},
+    **{c: _to_bool for c in BOOL_COLUMNS},
+    **{c: _normalize_timestamp for c in TIMESTAMP_COLUMNS},
+}
+
+
+def to_db(column: str, value):
+    """Convert a Python/JSON value into its SQLite storage form for a column."""
+    converter = _CONVERTERS.get(column)
+    if value is None or converter is None:
+        return value
+    return converter(value)
+
+
+def from_db(column: str, value):
+    if value is None:
+        return None
+    if column in JSON_COLUMNS:
+        return json.loads(value)
+    if column in BOOL_COLUMNS:
+        return bool(value)
+    return value
+
+
+def _fetch(conn: sqlite3.Connection, sql: str, params: list) -> list[dict]:
+    cursor = conn.execute(sql, params)
+    names = [d[0] for d in cursor.description]
+    decoded = [n for n in names if n in JSON_COLUMNS or n in BOOL_COLUMNS]
+    rows = []
+    for values in cursor.fetchall():
+        row = dict(zip(names, values))
+        for name in decoded:
+            row[name] = from_db(name, row[name])
+        rows.append(row)
+    return rows
+
+
+class SQLiteResponse:
+    def __init__(self, data: list[dict], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class SQLiteQuery:
+    def __init__(self, client: "SQLiteClient", table: str):
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns: Optional[list[str]] = None  # None means all columns
+        self._embeds: list[tuple[str, list[str]]] = []
+        self._where: list[str] = []
+        self._params: list = []
+        self._order: list[str] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+        self._payload = None
+        self._returning = "representation"
+        self._count = None
+
+    # Query building (mirrors postgrest's request builders)
+    def select(self, *columns: str, count=None, head=None) -> "SQLiteQuery":
+        spec = ",".join(columns) or "*"
+        self._embeds = [(table, [c.strip() for c in cols.split(",") if c.strip()]) for table, cols in _EMBED_RE.findall(spec)]
+        plain = [c.strip() for c in _EMBED_RE.sub("", spec).split(",") if c.strip()]
+        self._columns = None if not plain or "*" in plain else plain
+        self._count = count
+        return self
+
+    def insert(self, json, *, count=None, returning="representation", upsert=False, default_to_null=True) -> "SQLiteQuery":
+        self._action = "upsert" if upsert else "insert"
+        self._payload = json if isinstance(json, list) else [json]
+        self._returning = str(getattr(returning, "value", returning))
+        return self
+
+    def upsert(self, json, *, count=None, returning="representation", ignore_duplicates=False, on_conflict="", default_to_null=True) -> "SQLiteQuery":
+        return self.insert(json, returning=returning, upsert=True)
+
+    def update(self, json, *, count=None, returning="representation") -> "SQLiteQuery":
+        self._action = "update"
+        self._payload = json
+        self._returning = str(getattr(returning, "value", returning))
+        return self
+
+    def delete(self, *, count=None, returning="representation") -> "SQLiteQuery":
+        self._action = "delete"
+        self._returning = str(getattr(returning, "value", returning))
+        return self
+
+    def _filter(self, column: str, op: str, value) -> "SQLiteQuery":
+        self._where.append(f"{_ident(column)} {op} ?")
+        self._params.append(to_db(column, value))
+        return self
+
+    def eq(self, column: str, value): return self._filter(column, "=", value)
+    def neq(self, column: str, value): return self._filter(column, "!=", value)
+    def gt(self, column: str, value): return self._filter(column, ">", value)
+    def gte(self, column: str, value): return self._filter(column, ">=", value)
+    def lt(self, column: str, value): return self._filter(column, "<", value)
+    def lte(self, column: str, value): return self._filter(column, "<=", value)
+
+    def in_(self, column: str, values) -> "SQLiteQuery":
+        values = list(values)
+        if not values:
+            self._where.append("0")
+            return self
+        self._where.append(f"{_ident(column)} IN ({','.join('?' * len(values))})")
+        self._params += [to_db(column, v) for v in values]
+        return self
+
+    def is_(self, column: str, value) -> "SQLiteQuery":
+        if value in (None, "null"):
+            self._where.append(f"{_ident(column)} IS NULL")
+            return self
+        return self._filter(column, "IS", value)
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, foreign_table=None) -> "SQLiteQuery":
+        nulls_first = desc if nullsfirst is None else nullsfirst  # PostgREST default: NULLS LAST asc, FIRST desc
+        self._order.append(f"{_ident(column)} {'DESC' if desc else 'ASC'} NULLS {'FIRST' if nulls_first else 'LAST'}")
+        return self
+
+    def limit(self, size: int, *, foreign_table=None) -> "SQLiteQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table=None) -> "SQLiteQuery":
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    # Execution
+    def _where_sql(self) -> str:
+        return f" WHERE {' AND '.join(self._where)}" if self._where else ""
+
+    def execute(self) -> SQLiteResponse:
+        with self._client._lock:
+            if self._action == "select":
+                return self._select()
+            with self._client.conn:  # One transaction per write statement
+                return getattr(self, f"_{self._action}")()
+
+    def _select(self) -> SQLiteResponse:
+        table = _ident(self._table)
+        columns = "*"
+        fetch = self._columns
+        if fetch is not None:
+            extra = [EMBEDS[(self._table, t)] for t, _ in self._embeds if EMBEDS[(self._table, t)] not in fetch]
+            columns = ", ".join(_ident(c) for c in fetch + extra)
+        sql = f"SELECT {columns} FROM {table}{self._where_sql()}"
+        if self._order:
+            sql += f" ORDER BY {', '.join(self._order)}"
+        if self._limit is not None or self._offset is not None:
+            sql += f" LIMIT {int(self._limit if self._limit is not None else -1)} OFFSET {int(self._offset or 0)}"
+        rows = self._client.fetch(sql, self._params)
+        for embed_table, embed_columns in self._embeds:
+            self._attach_embed(rows, embed_table, embed_columns, drop_fk=fetch is not None and EMBEDS[(self._table, embed_table)] not in fetch)
+        count = None
+        if self._count:
+            count = self._client.conn.execute(f"SELECT COUNT(*) FROM {table}{self._where_sql()}", self._params).fetchone()[0]
+        return SQLiteResponse(rows, count)
+
+    def _attach_embed(self, rows: list[dict], embed_table: str, embed_columns: list[str], drop_fk: bool) -> None:
+        fk = EMBEDS[(self._table, embed_table)]
+        parent_ids = list({row[fk] for row in rows if row.get(fk)})
+        parents = {}
+        for i in range(0, len(parent_ids), MAX_VARIABLES):
+            chunk = parent_ids[i:i + MAX_VARIABLES]
+            for parent in self._client.fetch(f"SELECT * FROM {_ident(embed_table)} WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                parents[parent["id"]] = parent if "*" in embed_columns else {c: parent.get(c) for c in embed_columns}
+        for row in rows:
+            row[embed_table] = parents.get(row.get(fk))
+            if drop_fk:
+                row.pop(fk, None)
+
+    def _rows_by_id(self, ids: list[str]) -> list[dict]:
+        found = {}
+        for i in range(0, len(ids), MAX_VARIABLES):
+            chunk = ids[i:i + MAX_VARIABLES]
+            for row in self._client.fetch(f"SELECT * FROM {_ident(self._table)} WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                found[row["id"]] = row
+        return [found[i] for i in ids if i in found]
+
+    def _response(self, ids: list[str]) -> SQLiteResponse:
+        return SQLiteResponse(self._rows_by_id(ids) if self._returning != "minimal" else [])
+
+    def _insert(self, upsert: bool = False) -> SQLiteResponse:
+        now = datetime.now(timezone.utc).isoformat()
+        ids, groups = [], {}
+        for row in self._payload:
+            row = dict(row)
+            if "id" not in row:
+                row["id"] = str(uuid.uuid4())
+            for column in TIMESTAMP_DEFAULTS.get(self._table, ()):
+                row.setdefault(column, now)
+            ids.append(row["id"])
+            groups.setdefault(tuple(row), []).append(row)
+        table = _ident(self._table)
+        for columns, rows in groups.items():  # Rows omitting a column keep its SQL default
+            column_sql = ", ".join(_ident(c) for c in columns)
+            sql = f"INSERT INTO {table} ({column_sql}) VALUES ({', '.join('?' * len(columns))})"
+            if upsert:
+                updates = ", ".join(f"{_ident(c)} = excluded.{_ident(c)}" for c in columns if c != "id")
+                sql += f" ON CONFLICT(id) DO UPDATE SET {updates}" if updates else " ON CONFLICT(id) DO NOTHING"
+            converters = [_CONVERTERS.get(c) for c in columns]
+            self._client.conn.executemany(sql, [
+                [row[c] if conv is None or row[c] is None else conv(row[c]) for c, conv in zip(columns, converters)]
+                for row in rows
+            ])
+        return self._response(ids)
+
+    def _upsert(self) -> SQLiteResponse:
+        return self._insert(upsert=True)
+
+    def _matching_ids(self) -> list[str]:
+        sql = f"SELECT id FROM {_ident(self._table)}{self._where_sql()}"
+        return [r[0] for r in self._client.conn.execute(sql, self._params).fetchall()]
+
+    def _update(self) -> SQLiteResponse:
+        ids = self._matching_ids()
+        if ids and self._payload:
+            assignments = ", ".join(f"{_ident(c)} = ?" for c in self._payload)
+            values = [to_db(c, v) for c, v in self._payload.items()]
+            self._client.conn.execute(f"UPDATE {_ident(self._table)} SET {assignments}{self._where_sql()}", values + self._params)
+        return self._response(ids)
+
+    def _delete(self) -> SQLiteResponse:
+        ids = self._matching_ids()
+        rows = self._rows_by_id(ids) if self._returning != "minimal" else []
+        self._client.conn.execute(f"DELETE FROM {_ident(self._table)}{self._where_sql()}", self._params)
+        return SQLiteResponse(rows)
+
+
+class SQLiteRpc:
+    def __init__(self, client: "SQLiteClient", fn: str, params: dict):
+        self._client, self._fn, self._params = client, fn, params
+
+    def execute(self) -> SQLiteResponse:
+        handler = RPCS.get(self._fn)
+        if handler is None:
+            raise ValueError(f"Unknown RPC function: {self._fn}")
+        with self._client._lock, self._client.conn:
+            return SQLiteResponse(handler(self._client.conn, **self._params))
+
+
+def _set_boards_active(conn: sqlite3.Connection, p_board_ids: list[str], p_active: bool) -> list[dict]:
+    """SQLite port of the set_boards_active Postgres function (migrations/002_board_archive_rpc.sql)."""
+    now = datetime.now(timezone.utc).isoformat()
+    active = int(bool(p_active))
+    boards = cards = 0
+    for i in range(0, len(p_board_ids), MAX_VARIABLES):
+        chunk = p_board_ids[i:i + MAX_VARIABLES]
+        marks = ",".join("?" * len(chunk))
+        cards += conn.execute(
+            f"UPDATE cards SET is_active = ?, updated_at = ? WHERE board_id IN ({marks}) AND is_active IS NOT ?",
+            [active, now, *chunk, active],
+        ).rowcount
+        boards += conn.execute(f"UPDATE boards SET is_active = ?, updated_at = ? WHERE id IN ({marks})", [active, now, *chunk]).rowcount
+    return [{"boards_updated": boards, "cards_updated": cards}]
+
+
+def _apply_batch(conn: sqlite3.Connection, p_groups: list[dict], p_cascades: Optional[list[dict]] = None) -> dict:
+    """SQLite port of the apply_batch Postgres function (migrations/004_atomic_batch_rpc.sql)."""
+    if any(group["table"] not in ("boards", "cards") for group in p_groups):
+        raise ValueError("apply_batch only updates boards and cards")
+    missing = []
+    for group in p_groups:
+        found = set()
+        for i in range(0, len(group["ids"]), MAX_VARIABLES):
+            chunk = group["ids"][i:i + MAX_VARIABLES]
+            found.update(r[0] for r in conn.execute(f"SELECT id FROM {_ident(group['table'])} WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        missing += [{"table": group["table"], "id": row_id} for row_id in group["ids"] if row_id not in found]
+    result = {"missing": missing, "boards": [], "cards": []}
+    if missing:
+        return result
+    now = datetime.now(timezone.utc).isoformat()
+
+    def apply(table: str) -> None:
+        for group in (g for g in p_groups if g["table"] == table):
+            values = {**group["values"], "updated_at": now}
+            assignments = ", ".join(f"{_ident(c)} = ?" for c in values)
+            params = [to_db(c, v) for c, v in values.items()]
+            for i in range(0, len(group["ids"]), MAX_VARIABLES):
+                chunk = group["ids"][i:i + MAX_VARIABLES]
+                marks = ",".join("?" * len(chunk))
+                conn.execute(f"UPDATE {_ident(table)} SET {assignments} WHERE id IN ({marks})", params + chunk)
+                result[table] += _fetch(conn, f"SELECT * FROM {_ident(table)} WHERE id IN ({marks})", chunk)
+
+    apply("boards")
+    for cascade in p_cascades or []:
+        _set_boards_active(conn, cascade["board_ids"], cascade["active"])
+    apply("cards")
+    return result
+
+
+_HISTORY_DAYS = """
+    SELECT id,
+           row_number() OVER (PARTITION BY card_id, substr(timestamp, 1, 10) ORDER BY timestamp DESC, id DESC) AS rn,
+           first_value(old_priority) OVER (PARTITION BY card_id, substr(timestamp, 1, 10) ORDER BY timestamp, id) AS day_old,
+           count(*) OVER (PARTITION BY card_id, substr(timestamp, 1, 10)) AS n
+    FROM priority_history
+    WHERE timestamp >= ? AND timestamp < ?
+"""  # Timestamps are stored as UTC ISO strings, so the first 10 characters are the UTC day
+
+
+def _compact_priority_history(conn: sqlite3.Connection, p_retain_days: int = 30, p_since: Optional[str] = None) -> list[dict]:
+    """SQLite port of the compact_priority_history Postgres function (migrations/003_priority_history_retention.sql)."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=p_retain_days)).isoformat()
+    since_day = _normalize_timestamp(p_since)[:10] if p_since else ""  # UTC day start; "" sorts before every timestamp
+    window = [since_day, cutoff]
+    before = conn.total_changes  # rowcount is not reported for statements starting with WITH
+    conn.execute(
+        f"WITH days AS ({_HISTORY_DAYS}) UPDATE priority_history SET old_priority = days.day_old "
+        "FROM days WHERE priority_history.id = days.id AND days.rn = 1 AND days.n > 1",
+        window,
+    )
+    updated = conn.total_changes - before
+    deleted = conn.execute(
+        f"DELETE FROM priority_history WHERE id IN (SELECT id FROM ({_HISTORY_DAYS}) WHERE rn > 1)", window
+    ).rowcount
+    deleted += conn.execute(
+        "DELETE FROM priority_history WHERE timestamp >= ? AND timestamp < ? AND old_priority IS new_priority", window
+    ).rowcount
+    return [{"rows_updated": updated, "rows_deleted": deleted, "compacted_before": cutoff}]
+
+
+RPCS = {
+    "set_boards_active": _set_boards_active,
+    "compact_priority_history": _compact_priority_history,
+    "apply_batch": _apply_batch,
+}
+
+
+class SQLiteClient:
+    """Drop-in stand-in for supabase.Client backed by a local WAL-mode SQLite file."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable across app crashes; WAL makes commits cheap
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.executescript(SCHEMA)
+
+    def fetch(self, sql: str, params: list) -> list[dict]:
+        return _fetch(self.conn, sql, params)
+
+    def table(self, table_name: str) -> SQLiteQuery:
+        return SQLiteQuery(self, table_name)
+
+    def from_(self, table_name: str) -> SQLiteQuery:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> SQLiteRpc:
+        return SQLiteRpc(self, fn, params or {})
+
+    def close(self) -> None:
+        self.conn.close()
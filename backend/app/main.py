@@ -1,13 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import boards, cards, ai
+from app.api.routes import boards, cards, ai, batch, transfer, sync, focus
 from app.api.routes import settings as settings_routes
 from app.core.config import get_settings
+from app.services import deadlines, priority_history, warmup
+from app.services.write_journal import get_write_journal
+import asyncio
+import os
 
 app_settings = get_settings()
-PORT = 51723  # Random high port to avoid conflicts
+PORT = int(os.environ.get("CANBAN_PORT", "51723"))  # Random high port to avoid conflicts
 
-app = FastAPI(title="CanBan.AI", description="AI-Powered Kanban System", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = [asyncio.create_task(priority_history.run_compaction_schedule()), asyncio.create_task(deadlines.run_scheduler())]
+    journal = get_write_journal()
+    if journal:
+        tasks.append(asyncio.create_task(journal.run()))  # Sync journaled card writes to Supabase
+    yield
+    for task in tasks:
+        task.cancel()
+
+app = FastAPI(title="CanBan.AI", description="AI-Powered Kanban System", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -19,7 +35,11 @@ app.add_middleware(
 # Include routers
 app.include_router(boards.router, prefix="/api")
 app.include_router(cards.router, prefix="/api")
+app.include_router(focus.router, prefix="/api")
 app.include_router(ai.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(transfer.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
 app.include_router(settings_routes.router, prefix="/api")
 
 @app.get("/")
@@ -27,9 +47,16 @@ async def root():
     return {"message": "CanBan.AI API", "version": "1.0.0", "port": PORT}
 
 @app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+async def health_check():  # Healthy as soon as the socket is up; "warm" turns true once background warm-up is done
+    warmup.start()  # No-op once started; under plain `uvicorn app.main:app` the first health check starts it
+    return {"status": "healthy", "warm": warmup.is_warm(), "warmup": warmup.status()}
 
 if __name__ == "__main__":  # Run server when executed directly (PyInstaller)
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=PORT)
+
+    class Server(uvicorn.Server):
+        async def startup(self, sockets=None):
+            await super().startup(sockets)
+            warmup.start()  # Listening now: load clients and indexes without delaying /health
+
+    Server(uvicorn.Config(app, host="127.0.0.1", port=PORT)).run()
@@ -1,12 +1,18 @@
-from typing import Optional
-from openai import OpenAI
+from typing import Optional, TYPE_CHECKING
 from app.core.config import get_settings
 from app.db.database import get_supabase
+from app.services import card_events
+from app.services.deadlines import get_deadline_index
 from datetime import datetime, timezone
+import asyncio
 import json
 
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-def get_openai_client() -> OpenAI:
+
+def get_openai_client() -> "OpenAI":
+    from openai import OpenAI  # The SDK takes ~0.6s to import; keep it off the startup path
     settings = get_settings()
     return OpenAI(api_key=settings.openai_api_key)
 
@@ -91,6 +97,7 @@ Only output the JSON array, no other text."""
 
         # Update cards in database
         now = datetime.now(timezone.utc).isoformat()
+        updated = []
         for p in priorities:
             # Record priority history
             old_card = next((c for c in cards if c["id"] == p["id"]), None)
@@ -107,11 +114,13 @@ Only output the JSON array, no other text."""
                 }).execute()
 
             # Update card priority
-            supabase.table("cards").update({
+            updated += supabase.table("cards").update({
                 "priority": p["priority"],
                 "priority_reason": p["reasoning"],
                 "updated_at": now,
-            }).eq("id", p["id"]).execute()
+            }).eq("id", p["id"]).execute().data
+
+        card_events.cards_changed(updated)
 
         return {
             "cards_updated": len(priorities),
@@ -186,17 +195,11 @@ async def generate_daily_briefing() -> dict:
     )
     cards = cards_response.data
 
-    # Identify high priority and overdue tasks
+    # Identify high priority and overdue tasks (overdue comes from the deadline index, not a re-parse of every card)
     high_priority = [c for c in cards if c.get("priority", 3) <= 2]
-    overdue = []
-    for c in cards:
-        if c.get("deadline"):
-            try:
-                deadline = datetime.fromisoformat(c["deadline"].replace("Z", "+00:00"))
-                if deadline < now:
-                    overdue.append(c)
-            except (ValueError, TypeError):
-                pass
+    deadline_index = get_deadline_index()
+    await asyncio.to_thread(deadline_index.ensure_loaded, supabase)
+    overdue = deadline_index.due(now)
 
     # Build prompt for AI summary
     cards_summary = [{
@@ -315,10 +318,20 @@ Extract ALL actionable items. Be thorough but avoid duplicates. Output only vali
             result_text = result_text.split("\n", 1)[1]
             result_text = result_text.rsplit("```", 1)[0]
         result = json.loads(result_text)
-        for task in result.get("tasks", []): # Add board_id to each task
+        tasks = result.get("tasks", [])
+        from app.services.duplicates import get_duplicate_detector
+        matches = await asyncio.to_thread(get_duplicate_detector().find_duplicates, get_supabase(), board_id, tasks)
+        for task, match in zip(tasks, matches): # Add board_id and flag likely duplicates of existing cards or earlier tasks
             task["board_id"] = board_id
             task["status"] = "todo"
             task["position"] = 0
+            if match:
+                if "card_id" in match:
+                    task["duplicate_of"] = match["card_id"]
+                else:
+                    task["duplicate_of_index"] = match["task_index"]
+                task["duplicate_title"] = match["title"]
+                task["duplicate_score"] = match["score"]
         return result
     except Exception as e:
         raise Exception(f"AI task extraction failed: {str(e)}")
@@ -327,8 +340,15 @@ Extract ALL actionable items. Be thorough but avoid duplicates. Output only vali
 async def create_extracted_tasks(tasks: list) -> dict: # Bulk create cards from extracted tasks
     supabase = get_supabase()
     now = datetime.now(timezone.utc).isoformat()
-    created = []
-    for task in tasks:
+    created, skipped = [], []
+    unique = []
+    for task in tasks: # Skip only the duplicates the user was shown at extraction time and did not keep
+        flagged = task.get("duplicate_of") or task.get("duplicate_of_index") is not None
+        if flagged and not task.get("keep_duplicate"):
+            skipped.append({"title": task["title"], "duplicate_of": task.get("duplicate_of"), "duplicate_title": task.get("duplicate_title"), "score": task.get("duplicate_score")})
+        else:
+            unique.append(task)
+    for task in unique:
         card_data = {
             "board_id": task["board_id"],
             "title": task["title"],
@@ -346,4 +366,5 @@ async def create_extracted_tasks(tasks: list) -> dict: # Bulk create cards from
         response = supabase.table("cards").insert(card_data).execute()
         if response.data:
             created.append(response.data[0])
-    return {"created_count": len(created), "cards": created}
+    card_events.cards_changed(created)
+    return {"created_count": len(created), "cards": created, "skipped_duplicates": skipped}
@@ -0,0 +1,211 @@
+from datetime import datetime, timezone
+from pydantic import ValidationError
+from app.db.models import BatchOpType, BoardUpdate, CardMove, CardUpdate
+from app.services import card_events
+import json
+
+CHUNK_SIZE = 100  # Ids per ``in.(...)`` filter, keeps PostgREST URLs well under size limits
+MISSING_FUNCTION = "PGRST202"  # PostgREST error code when an RPC is not defined
+
+_TABLES = {
+    BatchOpType.UPDATE_CARD: "cards",
+    BatchOpType.MOVE_CARD: "cards",
+    BatchOpType.DELETE_CARD: "cards",
+    BatchOpType.RESTORE_CARD: "cards",
+    BatchOpType.UPDATE_BOARD: "boards",
+    BatchOpType.DELETE_BOARD: "boards",
+    BatchOpType.RESTORE_BOARD: "boards",
+}
+_PAYLOAD_MODELS = {
+    BatchOpType.UPDATE_CARD: CardUpdate,
+    BatchOpType.MOVE_CARD: CardMove,
+    BatchOpType.UPDATE_BOARD: BoardUpdate,
+}
+_FIXED_PAYLOADS = {
+    BatchOpType.DELETE_CARD: {"is_active": False},
+    BatchOpType.RESTORE_CARD: {"is_active": True},
+    BatchOpType.DELETE_BOARD: {"is_active": False},
+    BatchOpType.RESTORE_BOARD: {"is_active": True},
+}
+
+
+def chunked(items: list, size: int = CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def set_boards_active(supabase, board_ids: list[str], active: bool) -> dict:
+    """Archive or restore boards and all their cards in one transaction (set_boards_active RPC).
+
+    Databases without migrations/002_board_archive_rpc.sql fall back to two plain updates per chunk.
+    """
+    result = _set_boards_active(supabase, board_ids, active)
+    card_events.cards_invalidated()
+    return result
+
+
+def _set_boards_active(supabase, board_ids: list[str], active: bool) -> dict:
+    from postgrest.exceptions import APIError
+    try:
+        response = supabase.rpc("set_boards_active", {"p_board_ids": board_ids, "p_active": active}).execute()
+    except APIError as e:
+        if e.code != MISSING_FUNCTION:
+            raise
+        return _set_boards_active_fallback(supabase, board_ids, active)
+    row = response.data[0] if response.data else {}
+    return {"boards_updated": row.get("boards_updated", 0), "cards_updated": row.get("cards_updated", 0)}
+
+
+def _set_boards_active_fallback(supabase, board_ids: list[str], active: bool) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    boards_updated = cards_updated = 0
+    for chunk in chunked(board_ids):
+        cards = supabase.table("cards").update({"is_active": active, "updated_at": now}).in_("board_id", chunk).neq("is_active", active).execute()
+        boards = supabase.table("boards").update({"is_active": active, "updated_at": now}).in_("id", chunk).execute()
+        cards_updated += len(cards.data or [])
+        boards_updated += len(boards.data or [])
+    return {"boards_updated": boards_updated, "cards_updated": cards_updated}
+
+
+def build_payload(op: BatchOpType, data: dict) -> dict:
+    """Validate one operation's data and return the column values it writes."""
+    if op in _FIXED_PAYLOADS:
+        return dict(_FIXED_PAYLOADS[op])
+    try:
+        payload = _PAYLOAD_MODELS[op](**data).model_dump(exclude_unset=True, mode="json")
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+    if not payload:
+        raise ValueError("No fields to update")
+    return payload
+
+
+def group_updates(pending: dict[str, dict]) -> list[tuple[dict, list[str]]]:
+    """Group rows receiving identical values so each group is written by one UPDATE ... WHERE id IN (...)."""
+    groups: dict[str, tuple[dict, list[str]]] = {}
+    for row_id, payload in pending.items():
+        key = json.dumps(payload, sort_keys=True, default=str)
+        groups.setdefault(key, (payload, []))[1].append(row_id)
+    return list(groups.values())
+
+
+def _run_atomic(supabase, operations: list, pending: dict[str, dict[str, dict]], cascades: dict[str, bool], errors: dict) -> dict:
+    """Apply the whole batch in one server-side transaction (apply_batch RPC): every operation or none."""
+    groups = [
+        {"table": table, "ids": ids, "values": payload}
+        for table in ("boards", "cards")
+        for payload, ids in group_updates(pending[table])
+    ]
+    cascade_groups = [
+        {"board_ids": board_ids, "active": payload["is_active"]}
+        for payload, board_ids in group_updates({board_id: {"is_active": active} for board_id, active in cascades.items()})
+    ]
+    try:
+        result = supabase.rpc("apply_batch", {"p_groups": groups, "p_cascades": cascade_groups}).execute().data
+    except Exception as e:
+        card_events.cards_invalidated()  # If only the response was lost the batch may have committed; reload indexes
+        return _build_response(operations, {}, {}, errors, 1, abort=f"Batch not applied: {e}")
+    missing = {(row["table"], row["id"]) for row in result.get("missing") or []}
+    if missing:
+        failed = {key: f"{'Card' if key[0] == 'cards' else 'Board'} not found" for key in missing}
+        return _build_response(operations, {}, failed, errors, 1, abort="Batch aborted: another operation failed")
+    rows = {(table, row["id"]): row for table in ("boards", "cards") for row in result.get(table) or []}
+    if cascades:
+        card_events.cards_invalidated()
+    else:
+        card_events.cards_changed(result.get("cards") or [])
+    return _build_response(operations, rows, {}, errors, 1)
+
+
+def run_batch(supabase, operations: list, atomic: bool = False) -> dict:
+    """
+    Apply card/board operations in as few statements as possible.
+    Successive operations on the same row are merged, then rows receiving identical
+    values are updated together. Board archive/restore cascades to the board's cards.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    errors: dict[int, str] = {}
+    pending: dict[str, dict[str, dict]] = {"boards": {}, "cards": {}}
+    cascades: dict[str, bool] = {}
+    for i, operation in enumerate(operations):
+        try:
+            payload = build_payload(operation.op, operation.data)
+        except ValueError as e:
+            errors[i] = str(e)
+            continue
+        pending[_TABLES[operation.op]].setdefault(operation.id, {}).update(payload)
+        if operation.op in (BatchOpType.DELETE_BOARD, BatchOpType.RESTORE_BOARD):
+            cascades[operation.id] = payload["is_active"]
+
+    if atomic:
+        if errors:
+            return _build_response(operations, {}, {}, errors, 0, abort="Batch aborted: another operation is invalid")
+        return _run_atomic(supabase, operations, pending, cascades, errors)
+
+    statements = 0
+    rows: dict[tuple[str, str], dict] = {}
+    failed: dict[tuple[str, str], str] = {}
+    # Boards first, then board cascades, then cards so explicit card operations win over a cascade.
+    # Cascaded boards get is_active from set_boards_active, so the plain update only carries their other fields.
+    plain_boards = {}
+    for board_id, payload in pending["boards"].items():
+        if board_id in cascades:
+            payload = {k: v for k, v in payload.items() if k != "is_active"}
+        if payload:
+            plain_boards[board_id] = payload
+    for payload, ids in group_updates(plain_boards):
+        for chunk in chunked(ids):
+            statements += 1
+            try:
+                response = supabase.table("boards").update({**payload, "updated_at": now}).in_("id", chunk).execute()
+            except Exception as e:
+                failed.update({("boards", row_id): str(e) for row_id in chunk})
+                continue
+            rows.update({("boards", row["id"]): row for row in response.data})
+    cascade_groups = group_updates({board_id: {"is_active": active} for board_id, active in cascades.items()})
+    for payload, board_ids in cascade_groups:
+        for chunk in chunked(board_ids):
+            statements += 2  # The cascade, then reading back the boards it touched
+            try:
+                _set_boards_active(supabase, chunk, payload["is_active"])
+                response = supabase.table("boards").select("*").in_("id", chunk).execute()
+            except Exception as e:
+                failed.update({("boards", board_id): str(e) for board_id in chunk})
+                continue
+            rows.update({("boards", row["id"]): row for row in response.data})
+    for payload, ids in group_updates(pending["cards"]):
+        for chunk in chunked(ids):
+            statements += 1
+            try:
+                response = supabase.table("cards").update({**payload, "updated_at": now}).in_("id", chunk).execute()
+            except Exception as e:
+                failed.update({("cards", row_id): str(e) for row_id in chunk})
+                continue
+            rows.update({("cards", row["id"]): row for row in response.data})
+
+    if cascades:
+        card_events.cards_invalidated()
+    else:
+        card_events.cards_changed([row for (table, _), row in rows.items() if table == "cards"])
+    return _build_response(operations, rows, failed, errors, statements)
+
+
+def _build_response(operations: list, rows: dict, failed: dict, errors: dict, statements: int, abort: str = None) -> dict:
+    results = []
+    for i, operation in enumerate(operations):
+        key = (_TABLES[operation.op], operation.id)
+        result = {"index": i, "op": operation.op, "id": operation.id, "ok": False, "error": None, "data": None}
+        if i in errors:
+            result["error"] = errors[i]
+        elif key in failed:
+            result["error"] = failed[key]
+        elif abort:
+            result["error"] = abort
+        elif key not in rows:
+            result["error"] = f"{'Card' if key[0] == 'cards' else 'Board'} not found"
+        else:
+            result["ok"] = True
+            result["data"] = rows[key]
+        results.append(result)
+    applied = sum(1 for r in results if r["ok"])
+    return {"applied": applied, "failed": len(results) - applied, "statements": statements, "results": results}
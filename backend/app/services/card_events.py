@@ -0,0 +1,137 @@
+from typing import Optional, Protocol
+from datetime import datetime, timezone
+import copy
+import threading
+
+PAGE_SIZE = 1000  # PostgREST caps a single response at 1000 rows by default
+
+
+class CardListener(Protocol):
+    def on_cards_changed(self, cards: list[dict]) -> None: ...
+    def invalidate(self) -> None: ...
+
+
+_listeners: list[CardListener] = []
+
+
+def subscribe(listener: CardListener) -> CardListener:
+    """Register an in-process index to be told about card writes."""
+    _listeners.append(listener)
+    return listener
+
+
+def cards_changed(cards: list[dict]) -> None:
+    """Notify listeners of full card rows returned by a write (archived rows have is_active=False)."""
+    if not cards:
+        return
+    for listener in _listeners:
+        listener.on_cards_changed(cards)
+
+
+def cards_invalidated() -> None:
+    """Notify listeners that cards changed in bulk server-side (e.g. board archive) and must be reloaded."""
+    for listener in _listeners:
+        listener.invalidate()
+
+
+def is_active_card(card: dict) -> bool:
+    return card.get("is_active", True) is not False
+
+
+def load_active_cards(supabase, board_id: Optional[str] = None, columns: str = "*") -> list[dict]:
+    """Fetch every active card (optionally of one board), paging past the PostgREST row limit."""
+    cards, last_id = [], None
+    while True:  # Keyset on id: each page starts where the last ended instead of skipping an OFFSET
+        query = supabase.table("cards").select(columns).eq("is_active", True)  # columns must include id
+        if board_id:
+            query = query.eq("board_id", board_id)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(PAGE_SIZE).execute().data
+        cards += page
+        if len(page) < PAGE_SIZE:
+            return cards
+        last_id = page[-1]["id"]
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse a timestamp column (ISO string, possibly with a trailing Z) into an aware datetime."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class CardIndex:
+    """
+    Base for in-process indexes over all active cards: loaded lazily, then kept current via card_events.
+    Subclasses reset their state in _clear() (naming those attributes in STATE), fill it from a full
+    load in _build() and update it in _apply(). A load fetches and builds a staged copy without holding
+    the index lock, so writes never wait on the database; writes that arrive meanwhile are replayed
+    onto the copy before it is swapped in.
+    """
+
+    STATE: tuple[str, ...] = ()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()  # One load at a time
+        self._loaded = False
+        self._generation = 0  # Bumped by invalidate() so a load that raced it is thrown away
+        self._buffered: Optional[list[dict]] = None  # Writes seen while a load is in flight
+        self._clear()
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+    def _build(self, cards: list[dict]) -> None:
+        self._apply(cards)
+
+    def _apply(self, cards: list[dict]) -> None:
+        raise NotImplementedError
+
+    # card_events listener
+    def on_cards_changed(self, cards: list[dict]) -> None:
+        with self._lock:
+            if self._buffered is not None:
+                self._buffered += cards
+            if self._loaded:
+                self._apply(cards)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._loaded = False
+            self._clear()
+
+    def ensure_loaded(self, supabase) -> None:
+        with self._load_lock:
+            while True:
+                with self._lock:
+                    if self._loaded:
+                        return
+                    generation = self._generation
+                    self._buffered = []
+                try:
+                    staged = copy.copy(self)  # Shares settings; _clear() gives it its own state
+                    staged._clear()
+                    staged._build(load_active_cards(supabase))
+                except Exception:
+                    with self._lock:
+                        self._buffered = None
+                    raise
+                with self._lock:
+                    buffered, self._buffered = self._buffered, None
+                    if generation != self._generation:
+                        continue  # Invalidated mid-load (bulk server-side change): load again
+                    for name in self.STATE:
+                        setattr(self, name, getattr(staged, name))
+                    self._apply(buffered)
+                    self._loaded = True
+                    return
@@ -0,0 +1,183 @@
+from typing import Optional
+from datetime import datetime
+from bisect import bisect_left
+from app.services import card_events
+import heapq
+import math
+import re
+
+TITLE_WEIGHT = 3.0  # A title hit counts as three description hits
+BM25_K1 = 1.2  # Term-frequency saturation; postings store the saturated weight so ranking only multiplies by idf
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1]
+
+
+class CardSearchIndex(card_events.CardIndex):
+    """
+    In-process inverted index over active cards (title, description, tags, status, priority, deadline).
+    Loaded lazily from the database, then kept current by card write routes via card_events.
+    """
+
+    STATE = (
+        "_cards", "_terms", "_postings", "_tags", "_by_status", "_by_board", "_by_priority",
+        "_deadlines", "_vocab", "_vocab_dirty",
+    )
+
+    def _clear(self):
+        self._cards: dict[str, dict] = {}  # card_id -> card row
+        self._terms: dict[str, dict[str, float]] = {}  # card_id -> {token: weighted tf}
+        self._postings: dict[str, dict[str, float]] = {}  # token -> {card_id: saturated tf weight}
+        self._tags: dict[str, set[str]] = {}
+        self._by_status: dict[str, set[str]] = {}
+        self._by_board: dict[str, set[str]] = {}
+        self._by_priority: dict[int, set[str]] = {}
+        self._deadlines: dict[str, datetime] = {}
+        self._vocab: list[str] = []
+        self._vocab_dirty = False
+
+    def _build(self, cards: list[dict]) -> None:
+        for card in cards:
+            self._add(card)
+
+    def _apply(self, cards: list[dict]) -> None:
+        for card in cards:
+            self._remove(card["id"])
+            if card_events.is_active_card(card):
+                self._add(card)
+
+    def _add(self, card: dict) -> None:
+        card_id = card["id"]
+        terms: dict[str, float] = {}
+        for token in tokenize(card.get("title")):
+            terms[token] = terms.get(token, 0.0) + TITLE_WEIGHT
+        for token in tokenize(card.get("description")):
+            terms[token] = terms.get(token, 0.0) + 1.0
+        for token, tf in terms.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                self._vocab_dirty = True
+            posting[card_id] = tf * (BM25_K1 + 1) / (tf + BM25_K1)
+        self._cards[card_id] = card
+        self._terms[card_id] = terms
+        for tag in card.get("tags") or []:
+            self._tags.setdefault(tag.lower(), set()).add(card_id)
+        self._by_status.setdefault(card.get("status") or "todo", set()).add(card_id)
+        self._by_board.setdefault(card.get("board_id"), set()).add(card_id)
+        self._by_priority.setdefault(card.get("priority") or 3, set()).add(card_id)
+        deadline = card_events.parse_timestamp(card.get("deadline"))
+        if deadline:
+            self._deadlines[card_id] = deadline
+
+    def _remove(self, card_id: str) -> None:
+        card = self._cards.pop(card_id, None)
+        if card is None:
+            return
+        for token in self._terms.pop(card_id):
+            posting = self._postings[token]
+            posting.pop(card_id, None)
+            if not posting:
+                del self._postings[token]
+                self._vocab_dirty = True
+        for tag in card.get("tags") or []:
+            self._tags.get(tag.lower(), set()).discard(card_id)
+        self._by_status.get(card.get("status") or "todo", set()).discard(card_id)
+        self._by_board.get(card.get("board_id"), set()).discard(card_id)
+        self._by_priority.get(card.get("priority") or 3, set()).discard(card_id)
+        self._deadlines.pop(card_id, None)
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        matches = []
+        i = bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            matches.append(self._vocab[i])
+            i += 1
+        return matches
+
+    def search(
+        self,
+        q: str = "",
+        tags: Optional[list[str]] = None,
+        statuses: Optional[list[str]] = None,
+        priorities: Optional[list[int]] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None,
+        board_id: Optional[str] = None,
+        limit: int = 50,
+    ) -> tuple[int, list[tuple[float, dict]]]:
+        """
+        Return (total matches, top `limit` (score, card) pairs).
+        Every query term must match; the last term also matches as a prefix (search-as-you-type).
+        Without a text query, matches are ordered by priority then deadline.
+        """
+        deadline_from = card_events.parse_timestamp(deadline_from)
+        deadline_to = card_events.parse_timestamp(deadline_to)
+        with self._lock:
+            n_cards = len(self._cards) or 1
+            candidate_sets: list = []  # Sets of card ids, or postings dicts keyed by card id
+            term_postings: list[dict[str, float]] = []
+            terms = tokenize(q)
+            for i, term in enumerate(terms):
+                posting = self._postings.get(term, {})
+                if i == len(terms) - 1:
+                    expanded = [self._postings[t] for t in self._expand_prefix(term) if t != term]
+                    if expanded:
+                        posting = dict(posting)
+                        for other in expanded:
+                            for card_id, weight in other.items():
+                                if weight > posting.get(card_id, 0.0):
+                                    posting[card_id] = weight
+                term_postings.append(posting)
+                candidate_sets.append(posting)
+            for tag in tags or []:
+                candidate_sets.append(self._tags.get(tag.lower(), set()))
+            if statuses:
+                candidate_sets.append(set().union(*(self._by_status.get(s, set()) for s in statuses)))
+            if priorities:
+                candidate_sets.append(set().union(*(self._by_priority.get(p, set()) for p in priorities)))
+            if board_id:
+                candidate_sets.append(self._by_board.get(board_id, set()))
+
+            if candidate_sets:
+                candidate_sets.sort(key=len)
+                candidates = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            else:
+                candidates = set(self._cards)
+
+            if deadline_from or deadline_to:
+                candidates = {
+                    c for c in candidates
+                    if c in self._deadlines
+                    and (not deadline_from or self._deadlines[c] >= deadline_from)
+                    and (not deadline_to or self._deadlines[c] <= deadline_to)
+                }
+
+            if term_postings:
+                idfs = [math.log(1 + n_cards / len(p)) if p else 0.0 for p in term_postings]
+                if len(term_postings) == 1:  # Single term: rank by posting weight without a Python-level score loop
+                    posting, idf = term_postings[0], idfs[0]
+                    top = [(idf * posting[c], c) for c in heapq.nlargest(limit, candidates, key=posting.__getitem__)]
+                else:
+                    scored = ((sum(idf * p[c] for idf, p in zip(idfs, term_postings)), c) for c in candidates)
+                    top = heapq.nlargest(limit, scored)
+            else:
+                top = heapq.nsmallest(limit, ((self._filter_rank(c), c) for c in candidates))
+                top = [(0.0, c) for _, c in top]
+            return len(candidates), [(round(score, 4), self._cards[c]) for score, c in top]
+
+    def _filter_rank(self, card_id: str) -> tuple:
+        deadline = self._deadlines.get(card_id)
+        return (self._cards[card_id].get("priority") or 3, deadline is None, deadline.timestamp() if deadline else 0.0, card_id)
+
+
+_search_index = card_events.subscribe(CardSearchIndex())
+
+
+def get_search_index() -> CardSearchIndex:
+    return _search_index
@@ -0,0 +1,249 @@
+"""
+In-process deadline index over open cards (active, not done, with a deadline).
+
+A min-heap of upcoming deadlines answers "what is due before T" by walking only the
+entries it returns; deadlines move from it to a sorted overdue list as the clock passes
+them, so overdue cards are found by bisection and never walked past. A second heap of
+alert times drives a single event-loop timer that fires due-soon and overdue events
+exactly when they happen. All three use lazy deletion: a card's entries are valid only
+while its version matches.
+"""
+from typing import Callable, Optional
+from datetime import datetime, timedelta, timezone
+from app.services import card_events
+import asyncio
+import bisect
+import heapq
+import itertools
+import time
+
+DUE_SOON = "due_soon"
+OVERDUE = "overdue"
+MAX_TIMER_DELAY = 300.0  # Re-arm at least this often (seconds) so a suspended laptop catches up on wake
+COMPACT_RATIO = 2  # Rebuild a structure once stale entries outnumber live ones
+
+DeadlineListener = Callable[[dict], None]
+_WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_window(text: str) -> timedelta:
+    """Parse a window like "90m", "12h", "3d" or "1w" (a bare number means hours)."""
+    text = text.strip().lower()
+    unit = text[-1:] if text[-1:] in _WINDOW_UNITS else "h"
+    try:
+        amount = float(text[:-1] if text[-1:] in _WINDOW_UNITS else text)
+    except ValueError:
+        raise ValueError(f"Invalid window: {text!r} (use e.g. 90m, 12h, 3d, 1w)")
+    if amount < 0:
+        raise ValueError("Window must not be negative")
+    return timedelta(seconds=amount * _WINDOW_UNITS[unit])
+
+
+def is_open_card(card: dict) -> bool:
+    return card_events.is_active_card(card) and card.get("status") != "done" and bool(card.get("deadline"))
+
+
+class DeadlineIndex(card_events.CardIndex):
+    STATE = ("_cards", "_entries", "_heap", "_overdue", "_alerts")
+
+    def __init__(self, due_soon: timedelta = timedelta(hours=24)):
+        self.due_soon = due_soon
+        self._versions = itertools.count()
+        self._listeners: list[DeadlineListener] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at: Optional[float] = None
+        super().__init__()
+
+    def _clear(self):
+        self._cards: dict[str, dict] = {}  # card_id -> card row
+        self._entries: dict[str, tuple[float, int]] = {}  # card_id -> (deadline epoch, version)
+        self._heap: list[tuple[float, int, str]] = []  # (deadline, version, card_id), deadlines not yet passed
+        self._overdue: list[tuple[float, int, str]] = []  # Same entries once their deadline passed, sorted
+        self._alerts: list[tuple[float, int, str, str]] = []  # (fire at, version, kind, card_id)
+
+    def _build(self, cards: list[dict]) -> None:
+        now = time.time()
+        for card in cards:
+            if is_open_card(card):
+                self._add(card, now, catch_up=False)  # Alerts already in the past are not replayed
+
+    def _apply(self, cards: list[dict]) -> None:
+        now = time.time()
+        for card in cards:
+            previous = self._entries.get(card["id"])
+            self._remove(card["id"])
+            if is_open_card(card):
+                self._add(card, now, catch_up=True, previous_ts=previous[0] if previous else None)
+        self._compact()
+
+    # card_events listener
+    def on_cards_changed(self, cards: list[dict]) -> None:
+        super().on_cards_changed(cards)
+        self._rearm_soon()
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        if self._attached():  # The timer needs the index back; reload off the event loop
+            self._loop.call_soon_threadsafe(lambda: self._loop.create_task(self._reload()))
+
+    def ensure_loaded(self, supabase) -> None:
+        super().ensure_loaded(supabase)
+        self._rearm_soon()
+
+    def _add(self, card: dict, now: float, catch_up: bool, previous_ts: Optional[float] = None) -> None:
+        deadline = card_events.parse_timestamp(card["deadline"])
+        if deadline is None:
+            return
+        ts, version = deadline.timestamp(), next(self._versions)
+        self._cards[card["id"]] = card
+        self._entries[card["id"]] = (ts, version)
+        if ts > now:
+            heapq.heappush(self._heap, (ts, version, card["id"]))
+        else:
+            bisect.insort(self._overdue, (ts, version, card["id"]))
+        # A card that newly gets this deadline (created, reopened, rescheduled) alerts right away if it is already due
+        catch_up = catch_up and ts != previous_ts
+        soon_at = ts - self.due_soon.total_seconds()
+        if soon_at > now:
+            heapq.heappush(self._alerts, (soon_at, version, DUE_SOON, card["id"]))
+        elif catch_up and ts > now:
+            heapq.heappush(self._alerts, (now, version, DUE_SOON, card["id"]))
+        if ts > now:
+            heapq.heappush(self._alerts, (ts, version, OVERDUE, card["id"]))
+        elif catch_up:
+            heapq.heappush(self._alerts, (now, version, OVERDUE, card["id"]))
+
+    def _remove(self, card_id: str) -> None:
+        self._cards.pop(card_id, None)
+        self._entries.pop(card_id, None)
+
+    def _valid(self, version: int, card_id: str) -> bool:
+        entry = self._entries.get(card_id)
+        return entry is not None and entry[1] == version
+
+    def _compact(self) -> None:
+        live = len(self._entries)
+        if len(self._heap) + len(self._overdue) > COMPACT_RATIO * live + 64:
+            self._heap = [e for e in self._heap if self._valid(e[1], e[2])]
+            heapq.heapify(self._heap)
+            self._overdue = [e for e in self._overdue if self._valid(e[1], e[2])]
+        if len(self._alerts) > 2 * COMPACT_RATIO * live + 64:
+            self._alerts = [a for a in self._alerts if self._valid(a[1], a[3])]
+            heapq.heapify(self._alerts)
+
+    # Queries
+    def _settle(self, now: float) -> None:
+        """Move entries whose deadline has passed from the heap to the overdue list (they leave in order)."""
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._valid(entry[1], entry[2]):
+                if not self._overdue or self._overdue[-1] <= entry:
+                    self._overdue.append(entry)
+                else:
+                    bisect.insort(self._overdue, entry)
+
+    def due(self, before: datetime, after: Optional[datetime] = None, limit: Optional[int] = None) -> list[dict]:
+        """
+        Open cards with a deadline at or before `before` (and not before `after`), soonest first.
+        Overdue cards come from a bisection of the overdue list; upcoming ones from a best-first walk
+        of the heap array that visits only entries <= before and their direct children. For `after`
+        up to now this is O(log n + k log k) for k results; a later `after` also walks the entries
+        between now and `after`.
+        """
+        horizon = before.timestamp()
+        start = after.timestamp() if after else float("-inf")
+        result = []
+        with self._lock:
+            self._settle(time.time())
+            overdue = self._overdue
+            for i in range(bisect.bisect_left(overdue, (start,)), len(overdue)):
+                ts, version, card_id = overdue[i]
+                if ts > horizon or (limit is not None and len(result) >= limit):
+                    return result
+                if self._valid(version, card_id):
+                    result.append(self._cards[card_id])
+            heap = self._heap
+            frontier = [(heap[0], 0)] if heap else []
+            while frontier and (limit is None or len(result) < limit):
+                (ts, version, card_id), i = heapq.heappop(frontier)
+                if ts > horizon:
+                    break  # Every remaining entry is a descendant of something later than the horizon
+                if ts >= start and self._valid(version, card_id):
+                    result.append(self._cards[card_id])
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], child))
+        return result
+
+    # Alerts
+    def subscribe(self, listener: DeadlineListener) -> Callable[[], None]:
+        """Call listener({"type", "card", "at"}) on due-soon and overdue events. Returns an unsubscribe function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._rearm_soon()
+
+    async def _reload(self) -> None:
+        from app.db.database import get_supabase
+        try:
+            await asyncio.to_thread(lambda: self.ensure_loaded(get_supabase()))
+        except Exception:
+            pass  # Loaded again by the next due query
+
+    def _attached(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+
+    def _rearm_soon(self) -> None:
+        if self._attached():
+            self._loop.call_soon_threadsafe(self._rearm)
+
+    def _rearm(self) -> None:
+        """(Re)arm the single timer for the earliest pending alert; runs on the event loop."""
+        with self._lock:
+            while self._alerts and not self._valid(self._alerts[0][1], self._alerts[0][3]):
+                heapq.heappop(self._alerts)
+            fire_at = self._alerts[0][0] if self._alerts else None
+        if fire_at is not None and fire_at == self._timer_at:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = self._timer_at = None
+        if fire_at is not None:
+            delay = min(max(fire_at - time.time(), 0.0), MAX_TIMER_DELAY)
+            self._timer = self._loop.call_later(delay, self._fire)
+            self._timer_at = fire_at
+
+    def _fire(self) -> None:
+        self._timer = self._timer_at = None
+        now = time.time()
+        events = []
+        with self._lock:
+            while self._alerts and self._alerts[0][0] <= now:
+                _, version, kind, card_id = heapq.heappop(self._alerts)
+                if self._valid(version, card_id):
+                    events.append({"type": kind, "card": self._cards[card_id], "at": datetime.now(timezone.utc).isoformat()})
+        for event in events:
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception:
+                    pass  # One failing listener must not starve the others
+        self._rearm()
+
+
+_deadline_index = card_events.subscribe(DeadlineIndex())
+
+
+def get_deadline_index() -> DeadlineIndex:
+    return _deadline_index
+
+
+async def run_scheduler() -> None:
+    """Attach the index's alert timer to the running loop (started from the app lifespan). Warm-up loads the index."""
+    from app.core.config import get_settings
+    index = get_deadline_index()
+    index.due_soon = timedelta(hours=get_settings().due_soon_hours)
+    index.attach(asyncio.get_running_loop())
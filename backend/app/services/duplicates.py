@@ -0,0 +1,221 @@
+from typing import Optional
+from app.services import card_events
+import numpy as np
+import re
+import threading
+
+DIMENSIONS = 2 ** 12  # Hashed feature space; collisions are rare for card-sized text
+NGRAM = 3
+TITLE_WEIGHT = 0.8  # Share of the similarity carried by the title; descriptions vary more between pastes
+DUPLICATE_THRESHOLD = 0.9  # Cosine similarity above which two cards are treated as the same task
+_HASH_MULTIPLIERS = tuple(np.uint64(m) for m in (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9)[:NGRAM])
+_NORMALIZE_RE = re.compile(r"[^\w]+", re.UNICODE)
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def _ngram_weights(texts: list[Optional[str]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hashed character n-grams of many texts in one pass: (owner * DIMENSIONS + bucket keys, weights),
+    sorted by key, with each text's weights L2-normalized.
+    """
+    padded = [f" {t} " if t else "" for t in (_NORMALIZE_RE.sub(" ", (text or "").lower()).strip() for text in texts)]
+    sizes = np.array([max(len(p) - NGRAM + 1, 0) for p in padded], dtype=np.int64)
+    starts = np.cumsum([0] + [len(p) for p in padded[:-1]])
+    chars = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    owner = np.repeat(np.arange(len(texts), dtype=np.int64), sizes)
+    positions = np.arange(int(sizes.sum()), dtype=np.int64) - np.repeat(np.cumsum(sizes) - sizes, sizes) + starts[owner]
+    grams = np.zeros(len(positions), dtype=np.uint64)
+    for offset, multiplier in enumerate(_HASH_MULTIPLIERS):  # Multiplicative hash of every n-gram at once
+        grams ^= chars[positions + offset] * multiplier
+    keys, counts = np.unique(owner * DIMENSIONS + ((grams >> np.uint64(32)) % DIMENSIONS).astype(np.int64), return_counts=True)
+    norms = np.sqrt(np.bincount(keys // DIMENSIONS, weights=counts.astype(np.float64) ** 2, minlength=len(texts)))
+    return keys, counts / norms[keys // DIMENSIONS]
+
+
+def sparse_vectors(cards: list[tuple[Optional[str], Optional[str]]]) -> list[tuple[np.ndarray, np.ndarray]]:
+    """(buckets, weights) of the L2-normalized hashed n-gram vector of each (title, description)."""
+    if not cards:
+        return []
+    title_keys, title_weights = _ngram_weights([title for title, _ in cards])
+    description_keys, description_weights = _ngram_weights([description for _, description in cards])
+    keys, inverse = np.unique(np.concatenate([title_keys, description_keys]), return_inverse=True)
+    weights = np.bincount(inverse, weights=np.concatenate([TITLE_WEIGHT * title_weights, (1 - TITLE_WEIGHT) * description_weights]))
+    owner = keys // DIMENSIONS
+    norms = np.sqrt(np.bincount(owner, weights=weights ** 2, minlength=len(cards)))
+    weights = (weights / np.where(norms > 0, norms, 1.0)[owner]).astype(np.float32)
+    bounds = np.searchsorted(owner, np.arange(1, len(cards)))
+    buckets = (keys % DIMENSIONS).astype(np.int32)
+    return list(zip(np.split(buckets, bounds), np.split(weights, bounds)))
+
+
+def sparse_vector(title: Optional[str], description: Optional[str] = None) -> tuple[np.ndarray, np.ndarray]:
+    return sparse_vectors([(title, description)])[0]
+
+
+def vectorize(title: Optional[str], description: Optional[str] = None) -> np.ndarray:
+    """Dense form of sparse_vector (used for the handful of query tasks)."""
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    buckets, weights = sparse_vector(title, description)
+    vector[buckets] = weights
+    return vector
+
+
+def _numbers(title: Optional[str]) -> frozenset:
+    """Numbers in a title; "Chapter 5" and "Chapter 6" are different tasks however similar the text."""
+    return frozenset(_NUMBER_RE.findall(title or ""))
+
+
+class _BoardVectors:
+    """
+    One board's active cards as sparse rows (a card touches ~100 of the DIMENSIONS buckets).
+    Rows are swap-removed so updates stay O(1); scoring packs them into flat arrays once per change.
+    """
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.titles: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.vectors: list[tuple[np.ndarray, np.ndarray]] = []  # (buckets, weights) per row
+        self._packed: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None  # (row, bucket, weight) per nonzero
+
+    def add(self, card_id: str, title: str, vector: tuple[np.ndarray, np.ndarray]) -> None:
+        self._packed = None
+        if card_id in self.rows:
+            self.vectors[self.rows[card_id]] = vector
+            self.titles[self.rows[card_id]] = title
+            return
+        self.rows[card_id] = len(self.ids)
+        self.vectors.append(vector)
+        self.ids.append(card_id)
+        self.titles.append(title)
+
+    def remove(self, card_id: str) -> None:
+        row = self.rows.pop(card_id, None)
+        if row is None:
+            return
+        self._packed = None
+        last = len(self.ids) - 1
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            self.ids[row], self.titles[row] = self.ids[last], self.titles[last]
+            self.rows[self.ids[row]] = row
+        self.vectors.pop()
+        self.ids.pop()
+        self.titles.pop()
+
+    def similarities(self, vectors: np.ndarray) -> np.ndarray:
+        """Dot products of dense query vectors against every row: (len(vectors), len(ids))."""
+        if self._packed is None:
+            sizes = [len(buckets) for buckets, _ in self.vectors]
+            self._packed = (
+                np.repeat(np.arange(len(sizes), dtype=np.int32), sizes),
+                np.concatenate([b for b, _ in self.vectors]) if sizes else np.zeros(0, dtype=np.int32),
+                np.concatenate([w for _, w in self.vectors]) if sizes else np.zeros(0, dtype=np.float32),
+            )
+        owner, buckets, weights = self._packed
+        return np.stack([np.bincount(owner, weights=q[buckets] * weights, minlength=len(self.ids)) for q in vectors])
+
+
+class DuplicateDetector:
+    """
+    Offline near-duplicate detection over each board's active cards.
+    Boards are loaded on first use and updated incrementally via card_events.
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self._boards: dict[str, _BoardVectors] = {}
+        self._card_boards: dict[str, str] = {}
+        self._generation = 0  # Bumped by invalidate() so a board load that raced it is thrown away
+        self._loading = 0  # Board loads in flight
+        self._buffered: list[dict] = []  # Writes seen while a board load is in flight
+
+    # card_events listener
+    def on_cards_changed(self, cards: list[dict]) -> None:
+        with self._lock:
+            if self._loading:
+                self._buffered += cards
+            self._apply(cards)
+
+    def _apply(self, cards: list[dict]) -> None:
+        for card in cards:
+            old_board = self._card_boards.pop(card["id"], None)
+            if old_board in self._boards:
+                self._boards[old_board].remove(card["id"])
+            board = self._boards.get(card.get("board_id"))
+            if board is not None and card_events.is_active_card(card):
+                board.add(card["id"], card.get("title", ""), sparse_vector(card.get("title"), card.get("description")))
+                self._card_boards[card["id"]] = card["board_id"]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._boards.clear()
+            self._card_boards.clear()
+
+    def _board(self, supabase, board_id: str) -> _BoardVectors:
+        """The board's vectors, fetched and built without holding the lock on first use."""
+        while True:
+            with self._lock:
+                if board_id in self._boards:
+                    return self._boards[board_id]
+                generation, start = self._generation, len(self._buffered)
+                self._loading += 1
+            board = None
+            try:
+                cards = card_events.load_active_cards(supabase, board_id, columns="id, title, description")
+                board = _BoardVectors()
+                for card, vector in zip(cards, sparse_vectors([(c["title"], c.get("description")) for c in cards])):
+                    board.add(card["id"], card["title"], vector)
+            finally:
+                with self._lock:
+                    self._loading -= 1
+                    buffered = self._buffered[start:]
+                    if not self._loading:
+                        self._buffered = []
+                    if board is not None and generation == self._generation and board_id not in self._boards:
+                        self._boards[board_id] = board
+                        self._card_boards.update((card_id, board_id) for card_id in board.ids)
+                        self._apply(buffered)  # Replay writes the fetch may have missed
+
+    def find_duplicates(self, supabase, board_id: str, tasks: list[dict]) -> list[Optional[dict]]:
+        """
+        For each task ({"title", "description"}), return the most similar existing card or earlier task
+        in the same list as {"card_id" | "task_index", "title", "score"}, or None if nothing passes the threshold.
+        """
+        if not tasks:
+            return []
+        vectors = np.stack([vectorize(t.get("title"), t.get("description")) for t in tasks])
+        board = self._board(supabase, board_id)
+        with self._lock:
+            existing = board.similarities(vectors) if board.ids else None
+            ids, titles = list(board.ids), list(board.titles)
+        within = vectors @ vectors.T
+        numbers = [_numbers(t.get("title")) for t in tasks]
+        matches: list[Optional[dict]] = []
+        for i, task in enumerate(tasks):
+            match = None
+            if existing is not None:
+                best = self._best(existing[i], numbers[i], lambda j: titles[j])
+                if best is not None:
+                    match = {"card_id": ids[best], "title": titles[best], "score": round(float(existing[i, best]), 3)}
+            if match is None and i:
+                best = self._best(within[i, :i], numbers[i], lambda j: tasks[j].get("title"))
+                if best is not None:
+                    match = {"task_index": best, "title": tasks[best].get("title"), "score": round(float(within[i, best]), 3)}
+            matches.append(match)
+        return matches
+
+    def _best(self, scores: np.ndarray, numbers: frozenset, title_of) -> Optional[int]:
+        """Highest-scoring candidate above the threshold whose title carries the same numbers."""
+        for j in np.flatnonzero(scores >= self.threshold)[np.argsort(-scores[scores >= self.threshold])]:
+            if _numbers(title_of(int(j))) == numbers:
+                return int(j)
+        return None
+
+_detector = card_events.subscribe(DuplicateDetector())
+
+
+def get_duplicate_detector() -> DuplicateDetector:
+    return _detector
@@ -0,0 +1,86 @@
+"""
+Fast JSON rendering for card list routes.
+
+Rows come straight from our own database, so they are trusted: instead of validating
+every row against the Card model and encoding with the stdlib, rows are projected onto
+Card's fields and encoded with orjson. Encoded bodies can optionally be cached per
+board version, with versions bumped through card_events.
+"""
+from typing import Optional
+from fastapi import Response
+from app.db.models import Card
+from app.services import card_events
+import orjson
+import threading
+
+CARD_FIELDS = tuple(Card.model_fields)
+CARD_COLUMNS = ", ".join(CARD_FIELDS)  # Select exactly the Card fields so rows can be encoded as they are
+ALL_BOARDS = "*"  # Cache key for the all-cards listing
+
+
+def render_cards(rows: list[dict]) -> bytes:
+    """Encode trusted card rows as the JSON that response_model=list[Card] would produce."""
+    n = len(CARD_FIELDS)
+    return orjson.dumps([row if len(row) == n else {field: row.get(field) for field in CARD_FIELDS} for row in rows])
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+class CardResponseCache:
+    """
+    Encoded list responses keyed by board id, each stamped with the board's version.
+    Any card write bumps the version of the boards it touches, so a stale body is never served.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._bodies: dict[str, tuple[int, bytes]] = {}
+        self._card_boards: dict[str, str] = {}  # Card -> board it was last listed under, to catch moves
+
+    # card_events listener
+    def on_cards_changed(self, cards: list[dict]) -> None:
+        with self._lock:
+            for card in cards:
+                for board_id in (self._card_boards.pop(card["id"], None), card.get("board_id"), ALL_BOARDS):
+                    if board_id is not None:
+                        self._versions[board_id] = self._versions.get(board_id, 0) + 1
+                        self._bodies.pop(board_id, None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._versions = {key: version + 1 for key, version in self._versions.items()}
+            self._bodies.clear()
+            self._card_boards.clear()
+
+    def version(self, key: str) -> int:
+        """Read before querying; pass to store() so a write racing the query discards the body."""
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached and cached[0] == self._versions.get(key, 0):
+                return cached[1]
+            return None
+
+    def store(self, key: str, version: int, rows: list[dict], body: bytes) -> None:
+        with self._lock:
+            if version != self._versions.get(key, 0):
+                return
+            self._bodies[key] = (version, body)
+            if key != ALL_BOARDS:
+                for row in rows:
+                    self._card_boards[row["id"]] = key
+
+
+_response_cache = card_events.subscribe(CardResponseCache())
+
+
+def get_response_cache() -> Optional[CardResponseCache]:
+    """The encoded-response cache, or None unless enabled in settings (writes made outside this process would go unseen)."""
+    from app.core.config import get_settings
+    return _response_cache if get_settings().response_cache else None
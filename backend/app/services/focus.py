@@ -0,0 +1,115 @@
+"""
+Cross-board "what to work on next" queue.
+
+Every open card with a deadline gets an effective due time: the deadline pulled earlier by its
+AI priority and by being in progress. Ranking by that instant is the same as ranking by urgency
+at any moment, so the order never changes with the clock, only on card writes. Cards without a
+deadline rank after all dated ones, among themselves by priority and status. The queue keeps all open cards sorted by it, updated one card
+at a time via card_events, and serves the head from a cached slice.
+"""
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from app.services import card_events
+import bisect
+
+MAX_K = 100  # Largest k served (and cached)
+PRIORITY_LEAD = timedelta(hours=24)  # Each priority step above 3 acts as if the card were due a day sooner
+IN_PROGRESS_LEAD = timedelta(hours=24)  # Finishing started work beats starting new work due at the same time
+UNDATED_ANCHOR = datetime(9000, 1, 1, tzinfo=timezone.utc)  # Where cards without a deadline rank; age alone never makes them urgent
+
+
+def is_open_card(card: dict) -> bool:
+    return card_events.is_active_card(card) and card.get("status") != "done"
+
+
+def _lead(card: dict) -> timedelta:
+    lead = (3 - (card.get("priority") or 3)) * PRIORITY_LEAD
+    if card.get("status") == "in_progress":
+        lead += IN_PROGRESS_LEAD
+    return lead
+
+
+def effective_due(card: dict) -> Optional[datetime]:
+    """The card's deadline pulled earlier by priority and in-progress status (None without a deadline)."""
+    deadline = card_events.parse_timestamp(card.get("deadline"))
+    return deadline - _lead(card) if deadline is not None else None
+
+
+def _hours(delta: timedelta) -> str:
+    hours = abs(delta.total_seconds()) / 3600
+    return f"{hours:.0f}h" if hours < 48 else f"{hours / 24:.0f}d"
+
+
+def reasons(card: dict, now: datetime) -> list[str]:
+    """Short human-readable reasons a card ranks where it does."""
+    result = []
+    deadline = card_events.parse_timestamp(card.get("deadline"))
+    if deadline is not None:
+        result.append(f"overdue by {_hours(now - deadline)}" if deadline < now else f"due in {_hours(deadline - now)}")
+    else:
+        result.append("no deadline")
+    if card.get("status") == "in_progress":
+        result.append("in progress")
+    if (card.get("priority") or 3) <= 2:
+        result.append(f"priority {card['priority']}")
+    return result
+
+
+class FocusQueue(card_events.CardIndex):
+    STATE = ("_cards", "_keys", "_dues", "_order", "_head")
+
+    def _clear(self):
+        self._cards: dict[str, dict] = {}  # card_id -> card row
+        self._keys: dict[str, tuple[float, str]] = {}  # card_id -> its entry in _order
+        self._dues: dict[str, Optional[datetime]] = {}  # card_id -> effective due (None without a deadline)
+        self._order: list[tuple[float, str]] = []  # (rank, card_id), ascending
+        self._head: Optional[list[dict]] = None  # First MAX_K items, rebuilt after a write
+
+    def _build(self, cards: list[dict]) -> None:
+        for card in cards:
+            if is_open_card(card):
+                self._index(card)
+        self._order = sorted(self._keys.values())
+
+    def _apply(self, cards: list[dict]) -> None:
+        for card in cards:
+            self._remove(card["id"])
+            if is_open_card(card):
+                self._add(card)
+        self._head = None
+
+    def _index(self, card: dict) -> tuple[float, str]:
+        due = effective_due(card)
+        key = ((due or UNDATED_ANCHOR - _lead(card)).timestamp(), card["id"])
+        self._cards[card["id"]] = card
+        self._dues[card["id"]] = due
+        self._keys[card["id"]] = key
+        return key
+
+    def _add(self, card: dict) -> None:
+        bisect.insort(self._order, self._index(card))
+
+    def _remove(self, card_id: str) -> None:
+        key = self._keys.pop(card_id, None)
+        if key is None:
+            return
+        del self._order[bisect.bisect_left(self._order, key)]
+        del self._cards[card_id]
+        del self._dues[card_id]
+
+    def top(self, k: int) -> tuple[int, list[dict]]:
+        """(open card count, first k cards as {"card", "effective_due"}). Independent of the number of cards."""
+        with self._lock:
+            if self._head is None:
+                self._head = [
+                    {"card": self._cards[card_id], "effective_due": self._dues[card_id]}
+                    for _, card_id in self._order[:MAX_K]
+                ]
+            return len(self._order), self._head[:k]
+
+
+_focus_queue = card_events.subscribe(FocusQueue())
+
+
+def get_focus_queue() -> FocusQueue:
+    return _focus_queue
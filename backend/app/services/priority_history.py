@@ -0,0 +1,80 @@
+"""Keyset-paginated reads and scheduled compaction of the priority_history table."""
+from typing import Optional
+from app.core.config import get_settings
+import asyncio
+import base64
+import json
+
+FIRST_COMPACTION_DELAY = 60  # Seconds after startup, so compaction never competes with cold start
+COMPACTION_INTERVAL = 24 * 60 * 60
+
+
+def encode_cursor(row: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps([row["timestamp"], row["id"]]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Raises ValueError for a cursor this module did not produce."""
+    try:
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return timestamp, row_id
+
+
+def history_page(supabase, card_id: str, limit: int, before: Optional[str] = None) -> dict:
+    """
+    One page of a card's priority changes, newest first, continuing after the `before` cursor.
+    Keyset on (timestamp, id) so every page is an index range scan, however deep.
+    """
+    def query():
+        return supabase.table("priority_history").select("*").eq("card_id", card_id)
+
+    rows = []
+    if before:
+        timestamp, last_id = decode_cursor(before)
+        # Rows sharing the cursor's timestamp first, then strictly older ones
+        rows = query().eq("timestamp", timestamp).lt("id", last_id).order("id", desc=True).limit(limit + 1).execute().data
+        if len(rows) <= limit:
+            rows += (
+                query().lt("timestamp", timestamp)
+                .order("timestamp", desc=True).order("id", desc=True)
+                .limit(limit + 1 - len(rows)).execute().data
+            )
+    else:
+        rows = query().order("timestamp", desc=True).order("id", desc=True).limit(limit + 1).execute().data
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {"items": rows[:limit], "next_cursor": next_cursor}
+
+
+def compact(supabase, retain_days: Optional[int] = None, since: Optional[str] = None) -> dict:
+    """
+    Downsample history older than retain_days (compact_priority_history RPC).
+    With since (a previous result's compacted_before) only days from then on are revisited.
+    """
+    retain_days = retain_days or get_settings().priority_history_retain_days
+    params = {"p_retain_days": retain_days}
+    if since:
+        params["p_since"] = since
+    response = supabase.rpc("compact_priority_history", params).execute()
+    row = response.data[0] if response.data else {}
+    return {
+        "retain_days": retain_days,
+        "rows_updated": row.get("rows_updated", 0),
+        "rows_deleted": row.get("rows_deleted", 0),
+        "compacted_before": row.get("compacted_before"),
+    }
+
+
+async def run_compaction_schedule() -> None:
+    """Compact shortly after startup (whole table) and then once a day (only the newly expired days)."""
+    from app.db.database import get_supabase
+    await asyncio.sleep(FIRST_COMPACTION_DELAY)
+    since = None
+    while True:
+        try:
+            result = await asyncio.to_thread(lambda: compact(get_supabase(), since=since))
+            since = result["compacted_before"]
+        except Exception:
+            pass  # Offline or not configured yet; the next run catches up
+        await asyncio.sleep(COMPACTION_INTERVAL)
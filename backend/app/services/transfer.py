@@ -0,0 +1,143 @@
+from typing import AsyncIterator, Iterable, Iterator
+from datetime import datetime, timezone
+import json
+import uuid
+import zlib
+
+FORMAT = "canban-ndjson"
+FORMAT_VERSION = 1
+EXPORT_TABLES = ("boards", "cards", "priority_history", "activity_logs")  # Parents before children
+PAGE_SIZE = 1000  # Rows per keyset page when exporting
+IMPORT_BATCH_SIZE = 500  # Rows per bulk insert when importing
+CHUNK_BYTES = 64 * 1024  # Lines are buffered into chunks of about this size before being sent
+
+# table -> (foreign key column, parent table); rows are remapped onto the new parent ids
+FOREIGN_KEYS = {
+    "cards": ("board_id", "boards"),
+    "priority_history": ("card_id", "cards"),
+    "activity_logs": ("card_id", "cards"),
+}
+_PARENT_TABLES = {parent for _, parent in FOREIGN_KEYS.values()}
+
+
+def iter_table(supabase, table: str, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """Yield every row of a table using keyset pagination on id, so memory stays at one page."""
+    last_id = None
+    while True:
+        query = supabase.table(table).select("*").order("id").limit(page_size)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.execute().data
+        yield from page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
+
+
+def export_lines(supabase, tables: Iterable[str] = EXPORT_TABLES) -> Iterator[bytes]:
+    """Yield the workspace as NDJSON: a header line, then one {"table", "row"} line per row, table by table."""
+    header = {"format": FORMAT, "version": FORMAT_VERSION, "exported_at": datetime.now(timezone.utc).isoformat()}
+    yield json.dumps(header).encode() + b"\n"
+    for table in tables:
+        for row in iter_table(supabase, table):
+            yield json.dumps({"table": table, "row": row}, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+def buffered(lines: Iterable[bytes], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Group small lines into larger chunks to cut per-write overhead."""
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream incrementally into gzip format."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Parse NDJSON records from a (possibly gzip-compressed) byte stream without buffering it whole."""
+    decompressor = None
+    first = True
+    pending = b""
+    async for chunk in chunks:
+        if first and chunk:
+            if chunk[:2] == b"\x1f\x8b":
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            first = False
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if decompressor is not None:
+        pending += decompressor.flush()
+    if pending.strip():
+        yield json.loads(pending)
+
+
+class NdjsonImporter:
+    """
+    Bulk-inserts exported rows under fresh ids, remapping foreign keys as it goes.
+    Rows whose parent was not part of the import are skipped.
+    """
+
+    def __init__(self, supabase, batch_size: int = IMPORT_BATCH_SIZE):
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self.id_map: dict[str, dict[str, str]] = {table: {} for table in EXPORT_TABLES}
+        self.pending: dict[str, list[dict]] = {table: [] for table in EXPORT_TABLES}
+        self.imported: dict[str, int] = {table: 0 for table in EXPORT_TABLES}
+        self.skipped: dict[str, int] = {table: 0 for table in EXPORT_TABLES}
+        self.statements = 0
+
+    def add(self, record: dict) -> None:
+        table, row = record.get("table"), dict(record.get("row") or {})
+        if table not in self.id_map:
+            raise ValueError(f"Unknown table in import: {table}")
+        if table in FOREIGN_KEYS:
+            column, parent = FOREIGN_KEYS[table]
+            new_parent = self.id_map[parent].get(row.get(column))
+            if new_parent is None:
+                self.skipped[table] += 1
+                return
+            row[column] = new_parent
+        new_id = str(uuid.uuid4())
+        if table in _PARENT_TABLES and row.get("id") is not None:
+            self.id_map[table][row["id"]] = new_id
+        row["id"] = new_id
+        self.pending[table].append(row)
+        if len(self.pending[table]) >= self.batch_size:
+            self.flush(table)
+
+    def add_many(self, records: list[dict]) -> None:
+        for record in records:
+            self.add(record)
+
+    def flush(self, table: str) -> None:
+        if table in FOREIGN_KEYS:  # Parents must exist before children reference them
+            self.flush(FOREIGN_KEYS[table][1])
+        rows, self.pending[table] = self.pending[table], []
+        if not rows:
+            return
+        self.statements += 1
+        self.supabase.table(table).insert(rows, returning="minimal").execute()
+        self.imported[table] += len(rows)
+
+    def finish(self) -> dict:
+        for table in EXPORT_TABLES:
+            self.flush(table)
+        return {"imported": self.imported, "skipped": self.skipped, "statements": self.statements}
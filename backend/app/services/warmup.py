@@ -0,0 +1,88 @@
+"""
+Background warm-up started once the server socket is listening.
+
+/health answers immediately; meanwhile this builds the storage client, imports the
+OpenAI SDK and loads the in-process indexes so the first real request does not pay for them.
+The packaged server starts it right after binding; under plain ``uvicorn app.main:app``
+the first /health request starts it.
+"""
+from typing import Optional
+from datetime import datetime, timezone
+import threading
+import time
+
+_status = {"state": "pending", "started_at": None, "finished_at": None, "steps": {}}
+_started = threading.Event()
+
+
+def _storage_client():
+    from app.db.database import get_supabase
+    get_supabase()
+
+
+def _openai_sdk():
+    import openai  # noqa: F401
+
+
+def _search_index():
+    from app.db.database import get_supabase
+    from app.services.card_search import get_search_index
+    get_search_index().ensure_loaded(get_supabase())
+
+
+def _focus_queue():
+    from app.db.database import get_supabase
+    from app.services.focus import get_focus_queue
+    get_focus_queue().ensure_loaded(get_supabase())
+
+
+def _deadline_index():
+    from app.db.database import get_supabase
+    from app.services.deadlines import get_deadline_index
+    get_deadline_index().ensure_loaded(get_supabase())  # Arms the alert timer once loaded
+
+
+def _duplicate_detector():
+    from app.services.duplicates import get_duplicate_detector  # noqa: F401 (numpy)
+
+
+STEPS = (
+    ("storage_client", _storage_client),
+    ("openai_sdk", _openai_sdk),
+    ("search_index", _search_index),
+    ("focus_queue", _focus_queue),
+    ("deadline_index", _deadline_index),
+    ("duplicate_detector", _duplicate_detector),
+)
+
+
+def warm_up() -> dict:
+    """Run every warm-up step, recording its duration or error. Failures are not fatal: the step reruns on first use."""
+    _status.update(state="running", started_at=datetime.now(timezone.utc).isoformat())
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+            _status["steps"][name] = {"ms": round((time.perf_counter() - start) * 1000, 1)}
+        except Exception as e:  # e.g. Supabase not configured yet on first launch
+            _status["steps"][name] = {"ms": round((time.perf_counter() - start) * 1000, 1), "error": str(e)}
+    _status.update(state="done", finished_at=datetime.now(timezone.utc).isoformat())
+    return _status
+
+
+def start() -> Optional[threading.Thread]:
+    """Start warm-up on a daemon thread (once)."""
+    if _started.is_set():
+        return None
+    _started.set()
+    thread = threading.Thread(target=warm_up, name="canban-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_warm() -> bool:
+    return _status["state"] == "done"
+
+
+def status() -> dict:
+    return {**_status, "steps": dict(_status["steps"])}
@@ -0,0 +1,323 @@
+"""
+Local write-ahead journal for card writes.
+
+Card write routes append to a durable SQLite journal and answer immediately with
+the optimistic row; a background replayer pushes pending entries to Supabase in
+coalesced batches. Reads overlay pending entries so the UI never sees its own
+edits disappear. Conflicts are detected against the server's updated_at.
+"""
+from typing import Callable, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+from app.services import card_events
+from app.services.batch_ops import chunked, group_updates
+import asyncio
+import json
+import sqlite3
+import threading
+
+COALESCE_DELAY = 0.25  # Seconds to wait after a write so bursts (drag-and-drop) replay as one batch
+IDLE_INTERVAL = 5.0  # Seconds between replay attempts when nothing wakes the replayer
+MAX_BACKOFF = 60.0
+MAX_BATCH = 500  # Journal entries replayed per round
+DUPLICATE_KEY = "23505"  # Postgres unique_violation: an insert that already reached the server
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id TEXT NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('insert', 'update')),
+    payload TEXT NOT NULL,
+    base_updated_at TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_card_id ON entries(card_id);
+
+CREATE TABLE IF NOT EXISTS conflicts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT,
+    server_updated_at TEXT,
+    detected_at TEXT NOT NULL
+);
+"""
+
+
+class WriteJournal:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")  # An acknowledged edit must survive a power cut
+        self._conn.executescript(SCHEMA)
+        self._server_rows: dict[str, dict] = {}  # Last row seen from the server, per card
+        self._pending: dict[str, dict] = {}  # card_id -> {"insert": row | None, "changes": {...}, "base": updated_at}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.last_error: Optional[str] = None
+        self.last_synced_at: Optional[str] = None
+        self._reload_pending()
+
+    # Pending state
+    def _reload_pending(self, card_ids: Optional[list[str]] = None) -> None:
+        if card_ids is None:
+            self._pending.clear()
+            rows = self._conn.execute("SELECT card_id, op, payload, base_updated_at FROM entries ORDER BY seq").fetchall()
+        else:
+            for card_id in card_ids:
+                self._pending.pop(card_id, None)
+            rows = []
+            for chunk in chunked(card_ids):
+                rows += self._conn.execute(
+                    f"SELECT card_id, op, payload, base_updated_at FROM entries WHERE card_id IN ({','.join('?' * len(chunk))}) ORDER BY seq",
+                    chunk,
+                ).fetchall()
+        for card_id, op, payload, base in rows:
+            self._fold(self._pending, card_id, op, json.loads(payload), base)
+
+    @staticmethod
+    def _fold(pending: dict, card_id: str, op: str, payload: dict, base: Optional[str]) -> dict:
+        entry = pending.setdefault(card_id, {"insert": None, "changes": {}, "base": base})
+        if op == "insert":
+            entry["insert"] = dict(payload)
+        else:
+            entry["changes"].update(payload)
+        return entry
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def conflicts(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT card_id, kind, payload, server_updated_at, detected_at FROM conflicts ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            {"card_id": c, "kind": k, "payload": json.loads(p) if p else None, "server_updated_at": s, "detected_at": d}
+            for c, k, p, s, d in rows
+        ]
+
+    def remember(self, rows: list[dict]) -> None:
+        """Record rows as last seen on the server (used as the base for conflict detection)."""
+        with self._lock:
+            for row in rows:
+                self._server_rows[row["id"]] = row
+
+    def merged(self, card_id: str) -> Optional[dict]:
+        """The card as the user currently sees it: server row (or pending insert) plus pending changes."""
+        with self._lock:
+            entry = self._pending.get(card_id)
+            row = entry["insert"] if entry and entry["insert"] else self._server_rows.get(card_id)
+            if row is None:
+                return None
+            return {**row, **entry["changes"]} if entry else dict(row)
+
+    def overlay(self, rows: list[dict], match: Callable[[dict], bool] = lambda card: True, order_by: Optional[str] = None) -> list[dict]:
+        """Apply pending journal entries to rows read from the server, keeping only cards that still `match`."""
+        self.remember(rows)
+        with self._lock:
+            if not self._pending:
+                return rows
+            result = {row["id"]: self.merged(row["id"]) for row in rows}
+            for card_id in self._pending:
+                if card_id not in result:
+                    merged = self.merged(card_id)
+                    if merged is not None:
+                        result[card_id] = merged
+        cards = [card for card in result.values() if match(card)]
+        if order_by:
+            cards.sort(key=lambda card: (card.get(order_by) is None, card.get(order_by) or 0))
+        return cards
+
+    # Writes
+    def _append(self, entries: list[tuple[str, str, dict, Optional[str]]]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO entries (card_id, op, payload, base_updated_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(card_id, op, json.dumps(payload, default=str), base, now) for card_id, op, payload, base in entries],
+            )
+            for card_id, op, payload, base in entries:
+                self._fold(self._pending, card_id, op, payload, base)
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def insert(self, row: dict) -> dict:
+        self._append([(row["id"], "insert", row, None)])
+        return dict(row)
+
+    def update_many(self, changes: dict[str, dict]) -> dict[str, dict]:
+        """
+        Journal changes per card id without touching the server. Returns the optimistic rows of cards this
+        session has seen; unseen cards are journaled with no base and checked against the server on replay.
+        """
+        entries, result = [], {}
+        with self._lock:
+            for card_id, change in changes.items():
+                base = self._server_rows.get(card_id, {}).get("updated_at")
+                entries.append((card_id, "update", change, base))
+                current = self.merged(card_id)
+                if current is not None:
+                    result[card_id] = {**current, **change}
+        self._append(entries)
+        return result
+
+    def update(self, card_id: str, change: dict) -> Optional[dict]:
+        return self.update_many({card_id: change}).get(card_id)
+
+    def discard(self, card_id: str) -> None:
+        """Drop queued edits for a card the server turned out not to have."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE card_id = ?", (card_id,))
+            self._reload_pending([card_id])
+
+    # Replay
+    async def run(self) -> None:
+        """Background replayer: push pending entries whenever woken, backing off on failure."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._wake.set()  # Replay anything left over from the previous session
+        delay = IDLE_INTERVAL
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                await asyncio.sleep(COALESCE_DELAY)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._pending:
+                continue
+            try:
+                await asyncio.to_thread(self.drain)
+                self.last_error = None
+                delay = IDLE_INTERVAL
+            except Exception as e:
+                self.last_error = str(e)
+                delay = min(max(delay * 2, 1.0), MAX_BACKOFF)
+
+    def drain(self) -> None:
+        """Replay until the journal is empty. Runs off the event loop (building the client may import supabase)."""
+        from app.db.database import get_supabase
+        supabase = get_supabase()
+        while self.replay(supabase):
+            pass
+
+    def replay(self, supabase) -> int:
+        """Push one batch of pending entries. Returns the number of journal entries consumed."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, card_id, op, payload, base_updated_at FROM entries ORDER BY seq LIMIT ?", (MAX_BATCH,)
+            ).fetchall()
+        if not rows:
+            return 0
+        batch: dict[str, dict] = {}
+        seqs: dict[str, list[int]] = {}
+        for seq, card_id, op, payload, base in rows:
+            self._fold(batch, card_id, op, json.loads(payload), base)
+            seqs.setdefault(card_id, []).append(seq)
+
+        inserts = {card_id: {**e["insert"], **e["changes"]} for card_id, e in batch.items() if e["insert"]}
+        if inserts:
+            self._commit(supabase, seqs, *self._replay_inserts(supabase, inserts))
+        updates = {card_id: e for card_id, e in batch.items() if not e["insert"]}
+        if updates:
+            self._commit(supabase, seqs, *self._replay_updates(supabase, updates))
+        self.last_synced_at = datetime.now(timezone.utc).isoformat()
+        return len(rows)
+
+    def _replay_inserts(self, supabase, inserts: dict[str, dict]) -> tuple[list[str], list[dict], list[tuple]]:
+        from postgrest.exceptions import APIError
+        try:
+            return list(inserts), supabase.table("cards").insert(list(inserts.values())).execute().data, []
+        except APIError:
+            pass
+        done, confirmed, conflicts = [], [], []
+        for card_id, row in inserts.items():  # Isolate the rows the server rejects
+            try:
+                confirmed += supabase.table("cards").insert(row).execute().data
+            except APIError as e:
+                if e.code != DUPLICATE_KEY:
+                    conflicts.append((card_id, f"rejected: {e.message}", row, None))
+            done.append(card_id)
+        return done, confirmed, conflicts
+
+    def _replay_updates(self, supabase, updates: dict[str, dict]) -> tuple[list[str], list[dict], list[tuple]]:
+        server = {}
+        for chunk in chunked(list(updates)):
+            for row in supabase.table("cards").select("id, updated_at").in_("id", chunk).execute().data:
+                server[row["id"]] = row["updated_at"]
+        apply, conflicts = {}, []
+        for card_id, entry in updates.items():
+            changes, base = entry["changes"], entry["base"]
+            if card_id not in server:
+                conflicts.append((card_id, "missing", changes, None))
+                continue
+            server_ts = card_events.parse_timestamp(server[card_id])
+            # Someone else wrote since we read it; with no base (card edited before this session read it)
+            # only a server write newer than our edit counts
+            if base is None or server_ts != card_events.parse_timestamp(base):
+                edited_ts = card_events.parse_timestamp(changes.get("updated_at"))
+                if edited_ts and server_ts and server_ts > edited_ts:
+                    conflicts.append((card_id, "server_newer", changes, server[card_id]))
+                    continue
+                if base is not None:
+                    conflicts.append((card_id, "overwritten", changes, server[card_id]))  # Ours is newer: last writer wins
+            apply[card_id] = changes
+        confirmed = []
+        for payload, ids in group_updates(apply):
+            for chunk in chunked(ids):
+                confirmed += supabase.table("cards").update(payload).in_("id", chunk).execute().data
+        return list(updates), confirmed, conflicts
+
+    def _commit(self, supabase, seqs: dict[str, list[int]], done: list[str], confirmed: list[dict], conflicts: list[tuple]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        done_seqs = [seq for card_id in done for seq in seqs[card_id]]
+        dropped = [card_id for card_id, kind, _, _ in conflicts if kind != "overwritten"]  # Ours never reached the server
+        with self._lock:
+            stale = {card_id: self.merged(card_id) for card_id in dropped}  # What listeners were last told
+        fresh = []
+        for chunk in chunked(dropped):  # Re-read outside the lock; listeners must learn the server's version
+            fresh += supabase.table("cards").select("*").in_("id", chunk).execute().data
+        with self._lock, self._conn:
+            for chunk in chunked(done_seqs):
+                self._conn.execute(f"DELETE FROM entries WHERE seq IN ({','.join('?' * len(chunk))})", chunk)
+            self._conn.executemany(
+                "INSERT INTO conflicts (card_id, kind, payload, server_updated_at, detected_at) VALUES (?, ?, ?, ?, ?)",
+                [(card_id, kind, json.dumps(payload, default=str), server_ts, now) for card_id, kind, payload, server_ts in conflicts],
+            )
+            for card_id in dropped:
+                self._server_rows.pop(card_id, None)
+            self.remember(confirmed + fresh)
+            # Edits journaled while this batch was in flight were based on the row before it; our own write
+            # is now the server's version, so rebase them rather than flag our own edit as a conflict
+            self._conn.executemany(
+                "UPDATE entries SET base_updated_at = ? WHERE card_id = ?",
+                [(row.get("updated_at"), row["id"]) for row in confirmed],
+            )
+            self._reload_pending(done)
+            changed = [self.merged(row["id"]) for row in confirmed]
+            for card_id in dropped:
+                current = self.merged(card_id)
+                if current is None and stale[card_id] is not None:  # Gone from the server (or never got there)
+                    current = {**stale[card_id], "is_active": False}
+                if current is not None:
+                    changed.append(current)
+        card_events.cards_changed(changed)
+
+_journal: Optional[WriteJournal] = None
+
+
+def get_write_journal() -> Optional[WriteJournal]:
+    """The card write journal, or None when writes go straight to storage (journal disabled or local SQLite)."""
+    global _journal
+    from app.core.config import get_settings
+    settings = get_settings()
+    if not settings.write_journal or settings.storage_backend == "sqlite":
+        return None
+    if _journal is None:
+        _journal = WriteJournal(settings.journal_path or str(Path.home() / ".canban-ai" / "journal.db"))
+    return _journal
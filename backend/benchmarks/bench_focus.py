@@ -0,0 +1,55 @@
+"""
+Focus queue cost with tens of thousands of open cards: load, per-write update and GET /api/focus.
+
+Run from backend/:  python -m benchmarks.bench_focus [--cards 50000] [--repeat 1000]
+"""
+from app.services.focus import FocusQueue
+from benchmarks.fixtures import seed_workspace, temp_client
+from datetime import datetime, timedelta, timezone
+import argparse
+import random
+import statistics
+import time
+
+
+def _median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = temp_client()
+    seed_workspace(client, args.cards, history_per_card=0)
+    queue = FocusQueue()
+    start = time.perf_counter()
+    queue.ensure_loaded(client)
+    print(f"{args.cards} cards: load {(time.perf_counter() - start) * 1000:.0f} ms, {queue.top(1)[0]} open")
+
+    cards = list(queue._cards.values())
+    now = datetime.now(timezone.utc)
+
+    def write():
+        card = dict(random.choice(cards), priority=random.randint(1, 5),
+                    deadline=(now + timedelta(hours=random.uniform(-48, 240))).isoformat())
+        queue.on_cards_changed([card])
+
+    print(f"  card write update: {_median_us(write, args.repeat):.1f} us")
+    for k in (10, 50, 100):
+        print(f"  top {k:>3} after a write: {_median_us(lambda: (write(), queue.top(k)), args.repeat):.1f} us (incl. write)"
+              f", cached: {_median_us(lambda: queue.top(k), args.repeat):.2f} us")
+    start = time.perf_counter()
+    sorted(cards, key=lambda c: (c.get("priority") or 3, c.get("deadline") or ""))
+    print(f"  full re-sort for comparison: {(time.perf_counter() - start) * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
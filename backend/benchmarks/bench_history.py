@@ -0,0 +1,79 @@
+"""
+Priority history size and page latency over a simulated year of scheduled prioritization runs.
+
+Run from backend/:  python -m benchmarks.bench_history [--cards 1000] [--runs-per-day 4] [--change-rate 0.2] [--days 365]
+
+Each simulated day inserts the history rows that many AI runs would write, then runs the daily
+compaction as of that day, so the table is measured as it would look after a year of use.
+"""
+from app.services.priority_history import compact, history_page
+from benchmarks.fixtures import seed_workspace, temp_client
+from datetime import datetime, timedelta, timezone
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+
+def _page_latency(client, card_ids: list[str], repeat: int = 200) -> tuple[float, float]:
+    """Median ms for a first page and for following next_cursor three pages deep."""
+    first, deep = [], []
+    for _ in range(repeat):
+        card_id = random.choice(card_ids)
+        start = time.perf_counter()
+        page = history_page(client, card_id, 20)
+        first.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        for _ in range(3):
+            if not page["next_cursor"]:
+                break
+            page = history_page(client, card_id, 20, page["next_cursor"])
+        deep.append((time.perf_counter() - start) * 1000)
+    return statistics.median(first), statistics.median(deep)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--runs-per-day", type=int, default=4)
+    parser.add_argument("--change-rate", type=float, default=0.2, help="Share of cards whose priority changes per run")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--retain-days", type=int, default=30)
+    args = parser.parse_args()
+
+    client = temp_client()
+    card_ids = seed_workspace(client, args.cards, history_per_card=0)["cards"]
+    priorities = {card_id: 3 for card_id in card_ids}
+    now = datetime.now(timezone.utc)
+    inserted, compaction_ms, since = 0, [], None
+    print(f"{args.cards} cards, {args.runs_per_day} runs/day, {args.change_rate:.0%} of cards change per run")
+    for day in range(args.days, -1, -1):
+        rows = []
+        for run in range(args.runs_per_day):
+            ts = (now - timedelta(days=day, hours=24 * run / args.runs_per_day)).isoformat()
+            for card_id in random.sample(card_ids, int(len(card_ids) * args.change_rate)):
+                new = random.choice([p for p in range(1, 6) if p != priorities[card_id]])
+                rows.append({
+                    "id": str(uuid.uuid4()), "card_id": card_id, "old_priority": priorities[card_id], "new_priority": new,
+                    "reasoning": "benchmark", "model_used": "gpt-4o-mini", "timestamp": ts,
+                })
+                priorities[card_id] = new
+        for i in range(0, len(rows), 1000):
+            client.table("priority_history").insert(rows[i:i + 1000], returning="minimal").execute()
+        inserted += len(rows)
+        start = time.perf_counter()
+        since = compact(client, args.retain_days + day, since)["compacted_before"]  # The daily job, as of that simulated day
+        compaction_ms.append((time.perf_counter() - start) * 1000)
+        if day % 60 == 0:
+            size = client.table("priority_history").select("id", count="exact").limit(1).execute().count
+            first, deep = _page_latency(client, card_ids, repeat=50)
+            print(f"  day {args.days - day:>3}: {size:>8,} rows (uncompacted {inserted:>8,}), "
+                  f"page {first:.2f} ms, 4th page {deep:.2f} ms")
+    first, deep = _page_latency(client, card_ids)
+    print(f"compaction: median {statistics.median(compaction_ms):.1f} ms, max {max(compaction_ms):.1f} ms per daily run")
+    print(f"after {args.days} days: first page {first:.2f} ms, pages 2-4 {deep:.2f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
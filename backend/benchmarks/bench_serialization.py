@@ -0,0 +1,95 @@
+"""
+CPU and latency of the card list routes: validated stdlib JSON vs trusted-row orjson vs cached bytes.
+
+Run from backend/:  python -m benchmarks.bench_serialization [--sizes 1000 10000 50000] [--repeat 10]
+
+"validated" reproduces the previous path: FastAPI checks every row against
+response_model=list[Card] and encodes with the stdlib json module.
+"""
+import os
+
+os.environ["STORAGE_BACKEND"] = "sqlite"  # No write journal; the benchmark swaps in its own SQLite client
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from app.api.routes import cards as card_routes
+from app.db import database
+from app.db.models import Card
+from app.services import card_events
+from app.services.fast_json import CARD_COLUMNS, CardResponseCache, render_cards
+from benchmarks.fixtures import seed_workspace, temp_client
+import argparse
+import json
+import statistics
+import time
+
+CARD_LIST = TypeAdapter(list[Card])
+
+
+def _time(fn, repeat: int) -> tuple[float, float]:
+    """Median (wall ms, CPU ms) over repeat calls."""
+    wall, cpu = [], []
+    for _ in range(repeat):
+        w, c = time.perf_counter(), time.process_time()
+        fn()
+        wall.append((time.perf_counter() - w) * 1000)
+        cpu.append((time.process_time() - c) * 1000)
+    return statistics.median(wall), statistics.median(cpu)
+
+
+def _legacy_app(client) -> FastAPI:
+    legacy = FastAPI()
+
+    @legacy.get("/board/{board_id}", response_model=list[Card])
+    async def list_cards_by_board(board_id: str):
+        return client.table("cards").select("*").eq("board_id", board_id).eq("is_active", True).order("position").execute().data
+
+    return legacy
+
+
+def bench(size: int, repeat: int) -> None:
+    client = temp_client()
+    database._supabase_client = client
+    board_id = seed_workspace(client, size, cards_per_board=size, history_per_card=0)["boards"][0]
+    rows = client.table("cards").select("*").eq("board_id", board_id).eq("is_active", True).order("position").execute().data
+    card_rows = client.table("cards").select(CARD_COLUMNS).eq("board_id", board_id).eq("is_active", True).order("position").execute().data
+
+    from app.main import app
+    fast, legacy = TestClient(app), TestClient(_legacy_app(client))
+    cache = CardResponseCache()
+    card_routes.get_response_cache = lambda: None  # Measure the uncached route first
+
+    route = f"/api/cards/board/{board_id}"
+    assert len(fast.get(route).json()) == len(legacy.get(f"/board/{board_id}").json()) == size
+
+    query_ms = _time(lambda: client.table("cards").select("*").eq("board_id", board_id).eq("is_active", True).order("position").execute(), repeat)
+    cases = {
+        "encode validated": lambda: json.dumps(CARD_LIST.dump_python(CARD_LIST.validate_python(rows), mode="json")).encode(),
+        "encode orjson": lambda: render_cards(card_rows),
+        "GET validated": lambda: legacy.get(f"/board/{board_id}"),
+        "GET orjson": lambda: fast.get(route),
+    }
+    print(f"\n{size} cards on one board (query alone: {query_ms[0]:.1f} ms wall)")
+    for name, fn in cases.items():
+        wall, cpu = _time(fn, repeat)
+        print(f"{name:>18}: {wall:8.1f} ms wall  {cpu:8.1f} ms CPU")
+
+    card_events.subscribe(cache)
+    card_routes.get_response_cache = lambda: cache
+    fast.get(route)  # Fill the cache
+    wall, cpu = _time(lambda: fast.get(route), repeat)
+    print(f"{'GET cached bytes':>18}: {wall:8.1f} ms wall  {cpu:8.1f} ms CPU")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
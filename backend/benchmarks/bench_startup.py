@@ -0,0 +1,117 @@
+"""
+Cold-start time of the backend: `import app.main`, time until /health answers, and time until warm-up is done.
+
+Run from backend/:  python -m benchmarks.bench_startup [--runs 5] [--save baseline.json] [--baseline baseline.json]
+
+Each run is a fresh interpreter on the embedded SQLite backend, so it needs no network.
+With --baseline the exit status is 1 when a median regresses by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+POLL_INTERVAL = 0.005
+TIMEOUT = 60.0
+
+
+def _env(db_path: str, port: int) -> dict:
+    return {**os.environ, "STORAGE_BACKEND": "sqlite", "SQLITE_PATH": db_path, "CANBAN_PORT": str(port), "PYTHONPATH": BACKEND_DIR}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(db_path: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=_env(db_path, 0), capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def _get_health(port: int):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+            return json.loads(response.read())
+    except OSError:
+        return None
+
+
+def measure_server(db_path: str) -> tuple[float, float]:
+    """Spawn the server as Electron does and return (ms to first healthy response, ms until warm)."""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.main"], cwd=BACKEND_DIR, env=_env(db_path, port),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        healthy = None
+        while time.perf_counter() - start < TIMEOUT:
+            body = _get_health(port)
+            if body is not None:
+                if healthy is None:
+                    healthy = (time.perf_counter() - start) * 1000
+                if body.get("warm"):
+                    return healthy, (time.perf_counter() - start) * 1000
+            time.sleep(POLL_INTERVAL)
+        raise RuntimeError("backend did not become healthy and warm in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save", help="Write the medians to this JSON file")
+    parser.add_argument("--baseline", help="Compare against medians saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(prefix="canban-bench-", suffix=".db")
+    os.close(fd)
+    samples = {"import_ms": [], "first_healthy_ms": [], "warm_ms": []}
+    try:
+        for _ in range(args.runs):
+            samples["import_ms"].append(measure_import(db_path))
+            healthy, warm = measure_server(db_path)
+            samples["first_healthy_ms"].append(healthy)
+            samples["warm_ms"].append(warm)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    medians = {name: round(statistics.median(values), 1) for name, values in samples.items()}
+    print(f"cold start over {args.runs} runs (median, python {sys.version.split()[0]})")
+    for name, value in medians.items():
+        print(f"{name:>17}: {value:.1f} ms  (min {min(samples[name]):.1f}, max {max(samples[name]):.1f})")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(medians, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = [
+            f"{name}: {medians[name]:.1f} ms vs baseline {baseline[name]:.1f} ms"
+            for name in medians if name in baseline and medians[name] > baseline[name] * (1 + args.tolerance)
+        ]
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Read/write latency of the embedded SQLite backend for the queries the routes issue.
+
+Run from backend/:  python -m benchmarks.bench_storage [--cards 10000] [--cards-per-board 100] [--repeat 200]
+"""
+from benchmarks.fixtures import seed_workspace, temp_client
+from datetime import datetime, timezone
+import argparse
+import statistics
+import time
+
+
+def _time(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10_000)
+    parser.add_argument("--cards-per-board", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    client = temp_client()
+    ids = seed_workspace(client, args.cards, cards_per_board=args.cards_per_board)
+    board_id, card_id = ids["boards"][0], ids["cards"][0]
+    now = datetime.now(timezone.utc).isoformat()
+    cases = {
+        "get_card": lambda: client.table("cards").select("*").eq("id", card_id).execute(),
+        "list_cards_by_board": lambda: client.table("cards").select("*").eq("board_id", board_id).eq("is_active", True).order("position").execute(),
+        "list_boards": lambda: client.table("boards").select("*").eq("is_active", True).order("position").execute(),
+        "update_card": lambda: client.table("cards").update({"priority": 2, "updated_at": now}).eq("id", card_id).execute(),
+    }
+    print(f"sqlite backend, {args.cards} cards, {len(ids['boards'])} boards ({client.path})")
+    for name, fn in cases.items():
+        median, p95 = _time(fn, args.repeat)
+        print(f"{name:>22}: median {median:.3f} ms, p95 {p95:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
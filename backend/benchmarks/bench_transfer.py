@@ -0,0 +1,72 @@
+"""
+Export/import throughput and memory for a large workspace.
+
+Run from backend/:  python -m benchmarks.bench_transfer [--cards 100000] [--gzip]
+
+Runs against the embedded SQLite backend, so it needs no network or Supabase
+project; the numbers cover keyset paging, NDJSON encoding, compression,
+parsing and batched inserts rather than network latency.
+"""
+from app.services.transfer import EXPORT_TABLES, NdjsonImporter, buffered, export_lines, gzip_chunks, iter_ndjson
+from benchmarks.fixtures import seed_workspace, temp_client
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+
+def _export(store, use_gzip: bool):
+    chunks = buffered(export_lines(store))
+    return gzip_chunks(chunks) if use_gzip else chunks
+
+
+def bench_export(store, use_gzip: bool) -> list[bytes]:
+    start = time.perf_counter()
+    out = list(_export(store, use_gzip))  # Kept to feed the import benchmark
+    elapsed = time.perf_counter() - start
+    rows = sum(store.table(t).select("id", count="exact").limit(1).execute().count for t in EXPORT_TABLES)
+    size = sum(len(chunk) for chunk in out)
+    print(f"export: {rows} rows, {size / 1e6:.1f} MB in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+
+    tracemalloc.start()  # Second pass discards output, so the peak is the streaming working set
+    for _ in _export(store, use_gzip):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"export: peak traced memory while streaming {peak / 1e6:.2f} MB")
+    return out
+
+
+def bench_import(chunks: list[bytes]) -> None:
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        importer = NdjsonImporter(temp_client())
+        start = time.perf_counter()
+        records = iter_ndjson(stream())
+        await records.__anext__()  # Header
+        async for record in records:
+            importer.add(record)
+        result = importer.finish()
+        elapsed = time.perf_counter() - start
+        rows = sum(result["imported"].values())
+        print(f"import: {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s), {result['statements']} insert statements")
+
+    asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+    store = temp_client()
+    seed_workspace(store, args.cards)
+    chunks = bench_export(store, args.gzip)
+    bench_import(chunks)
+
+
+if __name__ == "__main__":
+    main()
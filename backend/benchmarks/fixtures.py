@@ -0,0 +1,65 @@
+"""Synthetic workspaces in the embedded SQLite backend, so benchmarks run fully offline."""
+from app.db.sqlite_backend import SQLiteClient
+from datetime import datetime, timedelta, timezone
+import atexit
+import os
+import random
+import tempfile
+import uuid
+
+WORDS = (
+    "report essay meeting review deploy budget research draft slides email client lecture "
+    "exam homework design api bug fix release plan outline reading notes summary"
+).split()
+INSERT_BATCH = 1000
+
+
+def _remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def temp_client() -> SQLiteClient:
+    """A SQLite-backed client on a throwaway file, deleted when the benchmark exits."""
+    fd, path = tempfile.mkstemp(prefix="canban-bench-", suffix=".db")
+    os.close(fd)
+    atexit.register(_remove_db, path)
+    return SQLiteClient(path)
+
+
+def seed_workspace(client: SQLiteClient, n_cards: int, cards_per_board: int = 1000, history_per_card: float = 0.5, seed: int = 7) -> dict:
+    """Insert boards, cards and priority history; returns {"boards": [ids], "cards": [ids]}."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    n_boards = max(1, n_cards // cards_per_board)
+    boards = [{"id": str(uuid.uuid4()), "name": f"Board {i}", "position": i} for i in range(n_boards)]
+    client.table("boards").insert(boards, returning="minimal").execute()
+    card_ids = []
+    for start in range(0, n_cards, INSERT_BATCH):
+        batch = []
+        for i in range(start, min(start + INSERT_BATCH, n_cards)):
+            card_id = str(uuid.uuid4())
+            card_ids.append(card_id)
+            deadline = now + timedelta(hours=rng.randint(-240, 2400)) if rng.random() < 0.7 else None
+            batch.append({
+                "id": card_id,
+                "board_id": boards[i % n_boards]["id"],
+                "title": " ".join(rng.sample(WORDS, 4)) + f" #{i}",
+                "description": " ".join(rng.choices(WORDS, k=20)),
+                "status": rng.choice(["todo", "todo", "in_progress", "done"]),
+                "priority": rng.randint(1, 5),
+                "estimated_hours": rng.choice([None, 0.5, 1.0, 2.0, 4.0]),
+                "deadline": deadline.isoformat() if deadline else None,
+                "position": i // n_boards,
+                "tags": rng.sample(WORDS, 2),
+                "metadata": {},
+            })
+        client.table("cards").insert(batch, returning="minimal").execute()
+    history = [
+        {"card_id": card_id, "old_priority": 3, "new_priority": rng.randint(1, 5), "reasoning": "bench", "model_used": "gpt-4o-mini"}
+        for card_id in card_ids[:int(n_cards * history_per_card)]
+    ]
+    for start in range(0, len(history), INSERT_BATCH):
+        client.table("priority_history").insert(history[start:start + INSERT_BATCH], returning="minimal").execute()
+    return {"boards": [b["id"] for b in boards], "cards": card_ids}
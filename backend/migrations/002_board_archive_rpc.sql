@@ -0,0 +1,25 @@
+-- Migration: Archive/restore boards in a single server-side call
+-- Run this in Supabase SQL Editor
+
+-- Sets is_active on the given boards and all of their cards in one transaction.
+-- Returns only row counts, so archiving a board with thousands of cards does not
+-- ship every updated row back to the client. Cards already in the target state are skipped.
+CREATE OR REPLACE FUNCTION set_boards_active(p_board_ids UUID[], p_active BOOLEAN)
+RETURNS TABLE (boards_updated INTEGER, cards_updated INTEGER)
+LANGUAGE plpgsql AS $$
+DECLARE
+    now_ts TIMESTAMPTZ := NOW();
+    n_boards INTEGER;
+    n_cards INTEGER;
+BEGIN
+    UPDATE cards SET is_active = p_active, updated_at = now_ts
+    WHERE board_id = ANY(p_board_ids) AND is_active IS DISTINCT FROM p_active;
+    GET DIAGNOSTICS n_cards = ROW_COUNT;
+
+    UPDATE boards SET is_active = p_active, updated_at = now_ts
+    WHERE id = ANY(p_board_ids);
+    GET DIAGNOSTICS n_boards = ROW_COUNT;
+
+    RETURN QUERY SELECT n_boards, n_cards;
+END;
+$$;
@@ -0,0 +1,54 @@
+-- Migration: Bound priority_history growth and support keyset pagination
+-- Run this in Supabase SQL Editor
+
+-- Serve "latest N changes of a card, then the next page" straight from the index
+DROP INDEX IF EXISTS idx_priority_history_card_id;
+CREATE INDEX IF NOT EXISTS idx_priority_history_card_id ON priority_history(card_id, timestamp DESC, id DESC);
+
+-- Lets incremental compaction scan only the days it has not seen yet
+CREATE INDEX IF NOT EXISTS idx_priority_history_timestamp ON priority_history(timestamp);
+
+-- Keeps every change from the last p_retain_days days. Older history is downsampled to one
+-- row per card per UTC day holding that day's net change (first old_priority -> last new_priority,
+-- with the last reasoning); days whose changes cancel out are dropped. Safe to run repeatedly.
+-- Pass the previous run's compacted_before as p_since to only revisit days from then on.
+CREATE OR REPLACE FUNCTION compact_priority_history(p_retain_days INTEGER DEFAULT 30, p_since TIMESTAMPTZ DEFAULT NULL)
+RETURNS TABLE (rows_updated INTEGER, rows_deleted INTEGER, compacted_before TIMESTAMPTZ)
+LANGUAGE plpgsql AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_retain_days);
+    -- Start of p_since's UTC day, so a day compacted on the previous run is merged as a whole
+    since_day TIMESTAMPTZ := COALESCE(((p_since AT TIME ZONE 'UTC')::date)::timestamp AT TIME ZONE 'UTC', '-infinity');
+    n_updated INTEGER;
+    n_merged INTEGER;
+    n_unchanged INTEGER;
+BEGIN
+    -- The last change of each day inherits the day's first old_priority
+    WITH days AS (
+        SELECT id,
+               row_number() OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date ORDER BY timestamp DESC, id DESC) AS rn,
+               first_value(old_priority) OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date ORDER BY timestamp, id) AS day_old,
+               count(*) OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date) AS n
+        FROM priority_history
+        WHERE timestamp >= since_day AND timestamp < cutoff
+    )
+    UPDATE priority_history p SET old_priority = days.day_old
+    FROM days WHERE p.id = days.id AND days.rn = 1 AND days.n > 1;
+    GET DIAGNOSTICS n_updated = ROW_COUNT;
+
+    -- ...and the day's other changes go
+    DELETE FROM priority_history p USING (
+        SELECT id, row_number() OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date ORDER BY timestamp DESC, id DESC) AS rn
+        FROM priority_history
+        WHERE timestamp >= since_day AND timestamp < cutoff
+    ) days
+    WHERE p.id = days.id AND days.rn > 1;
+    GET DIAGNOSTICS n_merged = ROW_COUNT;
+
+    DELETE FROM priority_history
+    WHERE timestamp >= since_day AND timestamp < cutoff AND old_priority IS NOT DISTINCT FROM new_priority;
+    GET DIAGNOSTICS n_unchanged = ROW_COUNT;
+
+    RETURN QUERY SELECT n_updated, n_merged + n_unchanged, cutoff;
+END;
+$$;
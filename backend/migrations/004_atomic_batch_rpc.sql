@@ -0,0 +1,68 @@
+-- Migration: Apply atomic batches in one server-side transaction
+-- Run this in Supabase SQL Editor
+
+-- Every group is written or none is. p_groups is [{"table": "boards" | "cards", "ids": [...], "values": {...}}];
+-- columns missing from "values" keep their current value. p_cascades is [{"board_ids": [...], "active": bool}]
+-- and sets is_active on those boards' cards, between the board and the card groups so explicit card
+-- values win. If any id does not exist nothing is written and the missing ids are returned.
+CREATE OR REPLACE FUNCTION apply_batch(p_groups JSONB, p_cascades JSONB DEFAULT '[]')
+RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    now_ts TIMESTAMPTZ := NOW();
+    grp JSONB;
+    group_ids UUID[];
+    missing JSONB;
+    board_rows JSONB := '[]';
+    card_rows JSONB := '[]';
+BEGIN
+    SELECT COALESCE(jsonb_agg(jsonb_build_object('table', g.value->>'table', 'id', i.id)), '[]')
+    INTO missing
+    FROM jsonb_array_elements(p_groups) g, jsonb_array_elements_text(g.value->'ids') AS i(id)
+    WHERE CASE g.value->>'table'
+        WHEN 'boards' THEN NOT EXISTS (SELECT 1 FROM boards WHERE id = i.id::UUID)
+        WHEN 'cards' THEN NOT EXISTS (SELECT 1 FROM cards WHERE id = i.id::UUID)
+    END;
+    IF jsonb_array_length(missing) > 0 THEN
+        RETURN jsonb_build_object('missing', missing, 'boards', board_rows, 'cards', card_rows);
+    END IF;
+
+    FOR grp IN SELECT value FROM jsonb_array_elements(p_groups) WHERE value->>'table' = 'boards' LOOP
+        group_ids := ARRAY(SELECT jsonb_array_elements_text(grp->'ids'))::UUID[];
+        WITH updated AS (
+            UPDATE boards b SET (name, description, color, position, is_active, updated_at) = (
+                SELECT r.name, r.description, r.color, r.position, r.is_active, now_ts
+                FROM jsonb_populate_record(b, grp->'values') r
+            )
+            WHERE b.id = ANY(group_ids)
+            RETURNING b.*
+        )
+        SELECT board_rows || COALESCE(jsonb_agg(to_jsonb(updated)), '[]') INTO board_rows FROM updated;
+    END LOOP;
+
+    FOR grp IN SELECT value FROM jsonb_array_elements(p_cascades) LOOP
+        UPDATE cards SET is_active = (grp->>'active')::BOOLEAN, updated_at = now_ts
+        WHERE board_id = ANY(ARRAY(SELECT jsonb_array_elements_text(grp->'board_ids'))::UUID[])
+          AND is_active IS DISTINCT FROM (grp->>'active')::BOOLEAN;
+    END LOOP;
+
+    FOR grp IN SELECT value FROM jsonb_array_elements(p_groups) WHERE value->>'table' = 'cards' LOOP
+        group_ids := ARRAY(SELECT jsonb_array_elements_text(grp->'ids'))::UUID[];
+        WITH updated AS (
+            UPDATE cards c SET (
+                board_id, title, description, status, priority, priority_reason, estimated_hours,
+                actual_hours, deadline, position, tags, metadata, is_active, updated_at
+            ) = (
+                SELECT r.board_id, r.title, r.description, r.status, r.priority, r.priority_reason, r.estimated_hours,
+                       r.actual_hours, r.deadline, r.position, r.tags, r.metadata, r.is_active, now_ts
+                FROM jsonb_populate_record(c, grp->'values') r
+            )
+            WHERE c.id = ANY(group_ids)
+            RETURNING c.*
+        )
+        SELECT card_rows || COALESCE(jsonb_agg(to_jsonb(updated)), '[]') INTO card_rows FROM updated;
+    END LOOP;
+
+    RETURN jsonb_build_object('missing', '[]'::JSONB, 'boards', board_rows, 'cards', card_rows);
+END;
+$$;
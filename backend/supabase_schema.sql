@@ -63,7 +63,144 @@ CREATE INDEX IF NOT EXISTS idx_cards_status ON cards(status);
 CREATE INDEX IF NOT EXISTS idx_cards_priority ON cards(priority);
 CREATE INDEX IF NOT EXISTS idx_cards_deadline ON cards(deadline);
 CREATE INDEX IF NOT EXISTS idx_activity_logs_card_id ON activity_logs(card_id);
-CREATE INDEX IF NOT EXISTS idx_priority_history_card_id ON priority_history(card_id);
+CREATE INDEX IF NOT EXISTS idx_priority_history_card_id ON priority_history(card_id, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_priority_history_timestamp ON priority_history(timestamp);
+
+-- Archive/restore boards and their cards atomically (see migrations/002_board_archive_rpc.sql)
+-- Returns only row counts, so archiving a board with thousands of cards does not
+-- ship every updated row back to the client. Cards already in the target state are skipped.
+CREATE OR REPLACE FUNCTION set_boards_active(p_board_ids UUID[], p_active BOOLEAN)
+RETURNS TABLE (boards_updated INTEGER, cards_updated INTEGER)
+LANGUAGE plpgsql AS $$
+DECLARE
+    now_ts TIMESTAMPTZ := NOW();
+    n_boards INTEGER;
+    n_cards INTEGER;
+BEGIN
+    UPDATE cards SET is_active = p_active, updated_at = now_ts
+    WHERE board_id = ANY(p_board_ids) AND is_active IS DISTINCT FROM p_active;
+    GET DIAGNOSTICS n_cards = ROW_COUNT;
+
+    UPDATE boards SET is_active = p_active, updated_at = now_ts
+    WHERE id = ANY(p_board_ids);
+    GET DIAGNOSTICS n_boards = ROW_COUNT;
+
+    RETURN QUERY SELECT n_boards, n_cards;
+END;
+$$;
+
+-- Downsample old priority history (see migrations/003_priority_history_retention.sql)
+-- Keeps every change from the last p_retain_days days. Older history is downsampled to one
+-- row per card per UTC day holding that day's net change (first old_priority -> last new_priority,
+-- with the last reasoning); days whose changes cancel out are dropped. Safe to run repeatedly.
+-- Pass the previous run's compacted_before as p_since to only revisit days from then on.
+CREATE OR REPLACE FUNCTION compact_priority_history(p_retain_days INTEGER DEFAULT 30, p_since TIMESTAMPTZ DEFAULT NULL)
+RETURNS TABLE (rows_updated INTEGER, rows_deleted INTEGER, compacted_before TIMESTAMPTZ)
+LANGUAGE plpgsql AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_retain_days);
+    -- Start of p_since's UTC day, so a day compacted on the previous run is merged as a whole
+    since_day TIMESTAMPTZ := COALESCE(((p_since AT TIME ZONE 'UTC')::date)::timestamp AT TIME ZONE 'UTC', '-infinity');
+    n_updated INTEGER;
+    n_merged INTEGER;
+    n_unchanged INTEGER;
+BEGIN
+    -- The last change of each day inherits the day's first old_priority
+    WITH days AS (
+        SELECT id,
+               row_number() OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date ORDER BY timestamp DESC, id DESC) AS rn,
+               first_value(old_priority) OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date ORDER BY timestamp, id) AS day_old,
+               count(*) OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date) AS n
+        FROM priority_history
+        WHERE timestamp >= since_day AND timestamp < cutoff
+    )
+    UPDATE priority_history p SET old_priority = days.day_old
+    FROM days WHERE p.id = days.id AND days.rn = 1 AND days.n > 1;
+    GET DIAGNOSTICS n_updated = ROW_COUNT;
+
+    -- ...and the day's other changes go
+    DELETE FROM priority_history p USING (
+        SELECT id, row_number() OVER (PARTITION BY card_id, (timestamp AT TIME ZONE 'UTC')::date ORDER BY timestamp DESC, id DESC) AS rn
+        FROM priority_history
+        WHERE timestamp >= since_day AND timestamp < cutoff
+    ) days
+    WHERE p.id = days.id AND days.rn > 1;
+    GET DIAGNOSTICS n_merged = ROW_COUNT;
+
+    DELETE FROM priority_history
+    WHERE timestamp >= since_day AND timestamp < cutoff AND old_priority IS NOT DISTINCT FROM new_priority;
+    GET DIAGNOSTICS n_unchanged = ROW_COUNT;
+
+    RETURN QUERY SELECT n_updated, n_merged + n_unchanged, cutoff;
+END;
+$$;
+
+-- Apply an atomic /api/batch request in one transaction (see migrations/004_atomic_batch_rpc.sql)
+-- Every group is written or none is. p_groups is [{"table": "boards" | "cards", "ids": [...], "values": {...}}];
+-- columns missing from "values" keep their current value. p_cascades is [{"board_ids": [...], "active": bool}]
+-- and sets is_active on those boards' cards, between the board and the card groups so explicit card
+-- values win. If any id does not exist nothing is written and the missing ids are returned.
+CREATE OR REPLACE FUNCTION apply_batch(p_groups JSONB, p_cascades JSONB DEFAULT '[]')
+RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    now_ts TIMESTAMPTZ := NOW();
+    grp JSONB;
+    group_ids UUID[];
+    missing JSONB;
+    board_rows JSONB := '[]';
+    card_rows JSONB := '[]';
+BEGIN
+    SELECT COALESCE(jsonb_agg(jsonb_build_object('table', g.value->>'table', 'id', i.id)), '[]')
+    INTO missing
+    FROM jsonb_array_elements(p_groups) g, jsonb_array_elements_text(g.value->'ids') AS i(id)
+    WHERE CASE g.value->>'table'
+        WHEN 'boards' THEN NOT EXISTS (SELECT 1 FROM boards WHERE id = i.id::UUID)
+        WHEN 'cards' THEN NOT EXISTS (SELECT 1 FROM cards WHERE id = i.id::UUID)
+    END;
+    IF jsonb_array_length(missing) > 0 THEN
+        RETURN jsonb_build_object('missing', missing, 'boards', board_rows, 'cards', card_rows);
+    END IF;
+
+    FOR grp IN SELECT value FROM jsonb_array_elements(p_groups) WHERE value->>'table' = 'boards' LOOP
+        group_ids := ARRAY(SELECT jsonb_array_elements_text(grp->'ids'))::UUID[];
+        WITH updated AS (
+            UPDATE boards b SET (name, description, color, position, is_active, updated_at) = (
+                SELECT r.name, r.description, r.color, r.position, r.is_active, now_ts
+                FROM jsonb_populate_record(b, grp->'values') r
+            )
+            WHERE b.id = ANY(group_ids)
+            RETURNING b.*
+        )
+        SELECT board_rows || COALESCE(jsonb_agg(to_jsonb(updated)), '[]') INTO board_rows FROM updated;
+    END LOOP;
+
+    FOR grp IN SELECT value FROM jsonb_array_elements(p_cascades) LOOP
+        UPDATE cards SET is_active = (grp->>'active')::BOOLEAN, updated_at = now_ts
+        WHERE board_id = ANY(ARRAY(SELECT jsonb_array_elements_text(grp->'board_ids'))::UUID[])
+          AND is_active IS DISTINCT FROM (grp->>'active')::BOOLEAN;
+    END LOOP;
+
+    FOR grp IN SELECT value FROM jsonb_array_elements(p_groups) WHERE value->>'table' = 'cards' LOOP
+        group_ids := ARRAY(SELECT jsonb_array_elements_text(grp->'ids'))::UUID[];
+        WITH updated AS (
+            UPDATE cards c SET (
+                board_id, title, description, status, priority, priority_reason, estimated_hours,
+                actual_hours, deadline, position, tags, metadata, is_active, updated_at
+            ) = (
+                SELECT r.board_id, r.title, r.description, r.status, r.priority, r.priority_reason, r.estimated_hours,
+                       r.actual_hours, r.deadline, r.position, r.tags, r.metadata, r.is_active, now_ts
+                FROM jsonb_populate_record(c, grp->'values') r
+            )
+            WHERE c.id = ANY(group_ids)
+            RETURNING c.*
+        )
+        SELECT card_rows || COALESCE(jsonb_agg(to_jsonb(updated)), '[]') INTO card_rows FROM updated;
+    END LOOP;
+
+    RETURN jsonb_build_object('missing', '[]'::JSONB, 'boards', board_rows, 'cards', card_rows);
+END;
+$$;
 
 -- Insert default boards (your 7 workstreams)
 INSERT INTO boards (name, description, color, position) VALUES
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { Sparkles, Loader2, Check, X, Calendar, Clock } from 'lucide-react'
+import { Sparkles, Loader2, Check, X, Calendar, Clock, Copy } from 'lucide-react'
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from '@/components/ui/dialog'
 import { Button } from '@/components/ui/button'
 import { Textarea } from '@/components/ui/textarea'
@@ -51,8 +51,12 @@ export function ExtractTasksDialog({ open, onOpenChange, boardId, boardName: _bo
     }
   }
 
+  const isFlagged = (task: ExtractedTask) => !!task.duplicate_of || task.duplicate_of_index != null
+  const willCreate = (task: ExtractedTask) => !isFlagged(task) || !!task.keep_duplicate
+  const createCount = extractedTasks.filter(willCreate).length
+
   const handleCreate = async () => {
-    if (extractedTasks.length === 0) return
+    if (createCount === 0) return
     setIsCreating(true)
     try {
       await aiApi.createExtractedTasks(extractedTasks)
@@ -67,7 +71,15 @@ export function ExtractTasksDialog({ open, onOpenChange, boardId, boardName: _bo
   }
 
   const handleRemoveTask = (index: number) => {
-    setExtractedTasks(prev => prev.filter((_, i) => i !== index))
+    setExtractedTasks(prev => prev.filter((_, i) => i !== index).map(task => { // Keep in-paste duplicate links pointing at the right task
+      if (task.duplicate_of_index == null || task.duplicate_of_index < index) return task
+      if (task.duplicate_of_index > index) return { ...task, duplicate_of_index: task.duplicate_of_index - 1 }
+      return { ...task, duplicate_of_index: null, duplicate_title: null, duplicate_score: null, keep_duplicate: false }
+    }))
+  }
+
+  const handleToggleKeep = (index: number) => {
+    setExtractedTasks(prev => prev.map((task, i) => i === index ? { ...task, keep_duplicate: !task.keep_duplicate } : task))
   }
 
   const handleClose = () => {
@@ -146,7 +158,7 @@ Example:
                 <div className="space-y-3">
                   <p className="text-sm font-medium">{extractedTasks.length} task{extractedTasks.length !== 1 ? 's' : ''} extracted:</p>
                   {extractedTasks.map((task, index) => (
-                    <div key={index} className="border rounded-lg p-3 bg-card group">
+                    <div key={index} className={`border rounded-lg p-3 bg-card group ${willCreate(task) ? '' : 'opacity-60'}`}>
                       <div className="flex items-start justify-between gap-2">
                         <div className="flex-1 min-w-0">
                           <div className="flex items-center gap-2 mb-1">
@@ -167,6 +179,18 @@ Example:
                               {task.tags.map((tag) => (<span key={tag} className="px-1.5 py-0.5 bg-secondary rounded text-xs">{tag}</span>))}
                             </div>
                           )}
+                          {isFlagged(task) && (
+                            <div className="flex items-center justify-between gap-2 mt-2 text-xs text-orange-400">
+                              <span className="flex items-center gap-1 min-w-0">
+                                <Copy className="h-3 w-3 shrink-0" />
+                                <span className="truncate">Looks like "{task.duplicate_title}"{task.duplicate_score ? ` (${Math.round(task.duplicate_score * 100)}%)` : ''}</span>
+                              </span>
+                              <label className="flex items-center gap-1 shrink-0 cursor-pointer text-muted-foreground">
+                                <input type="checkbox" checked={!!task.keep_duplicate} onChange={() => handleToggleKeep(index)} />
+                                Create anyway
+                              </label>
+                            </div>
+                          )}
                         </div>
                         <Button variant="ghost" size="icon" className="h-7 w-7 opacity-0 group-hover:opacity-100" onClick={() => handleRemoveTask(index)}>
                           <X className="h-4 w-4" />
@@ -179,8 +203,8 @@ Example:
             </div>
             <DialogFooter>
               <Button variant="outline" onClick={() => setStep('input')}>Back</Button>
-              <Button onClick={handleCreate} disabled={extractedTasks.length === 0 || isCreating}>
-                {isCreating ? <><Loader2 className="h-4 w-4 mr-2 animate-spin" />Creating...</> : <><Check className="h-4 w-4 mr-2" />Create {extractedTasks.length} Task{extractedTasks.length !== 1 ? 's' : ''}</>}
+              <Button onClick={handleCreate} disabled={createCount === 0 || isCreating}>
+                {isCreating ? <><Loader2 className="h-4 w-4 mr-2 animate-spin" />Creating...</> : <><Check className="h-4 w-4 mr-2" />Create {createCount} Task{createCount !== 1 ? 's' : ''}</>}
               </Button>
             </DialogFooter>
           </>
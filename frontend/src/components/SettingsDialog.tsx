@@ -3,7 +3,7 @@ import { Settings, Eye, EyeOff, ExternalLink, Check, AlertCircle, Loader2 } from
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from '@/components/ui/dialog'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
-import { settingsApi } from '@/lib/api'
+import { settingsApi, type StorageBackend } from '@/lib/api'
 
 interface SettingsDialogProps { open: boolean; onOpenChange: (open: boolean) => void }
 
@@ -11,6 +11,7 @@ export function SettingsDialog({ open, onOpenChange }: SettingsDialogProps) {
   const [supabaseUrl, setSupabaseUrl] = useState('')
   const [supabaseKey, setSupabaseKey] = useState('')
   const [openaiKey, setOpenaiKey] = useState('')
+  const [storageBackend, setStorageBackend] = useState<StorageBackend>('supabase')
   const [showKeys, setShowKeys] = useState(false)
   const [saving, setSaving] = useState(false)
   const [saved, setSaved] = useState(false)
@@ -27,7 +28,7 @@ export function SettingsDialog({ open, onOpenChange }: SettingsDialogProps) {
       }
       const timeout = setTimeout(() => { setLoading(false); loadLocal(); setError('Backend not responding. Enter your keys below.') }, 3000)
       settingsApi.get()
-        .then(res => { clearTimeout(timeout); setSupabaseUrl(res.data.supabase_url || ''); setSupabaseKey(res.data.supabase_key || ''); setOpenaiKey(res.data.openai_api_key || '') })
+        .then(res => { clearTimeout(timeout); setSupabaseUrl(res.data.supabase_url || ''); setSupabaseKey(res.data.supabase_key || ''); setOpenaiKey(res.data.openai_api_key || ''); setStorageBackend(res.data.storage_backend || 'supabase') })
         .catch(() => { clearTimeout(timeout); loadLocal(); setError('Backend not running. Enter keys below.') })
         .finally(() => setLoading(false))
     }
@@ -36,7 +37,7 @@ export function SettingsDialog({ open, onOpenChange }: SettingsDialogProps) {
   const handleSave = async () => {
     setSaving(true); setError('')
     try {
-      await settingsApi.save({ supabase_url: supabaseUrl, supabase_key: supabaseKey, openai_api_key: openaiKey })
+      await settingsApi.save({ supabase_url: supabaseUrl, supabase_key: supabaseKey, openai_api_key: openaiKey, storage_backend: storageBackend })
       setSaved(true); setTimeout(() => setSaved(false), 2000)
     } catch {
       // Fallback: save to localStorage if backend unavailable
@@ -74,6 +75,16 @@ export function SettingsDialog({ open, onOpenChange }: SettingsDialogProps) {
               <p className="text-muted-foreground">The app will use these keys after restart.</p>
             </div>
 
+            {/* Storage Backend */}
+            <div className="space-y-2">
+              <label className="text-sm font-medium">Storage</label>
+              <select value={storageBackend} onChange={(e) => setStorageBackend(e.target.value as StorageBackend)} className="flex h-9 w-full rounded-md border border-input bg-transparent px-3 py-1 text-sm">
+                <option value="supabase">Supabase (cloud)</option>
+                <option value="sqlite">Local (SQLite on this computer)</option>
+              </select>
+              <p className="text-xs text-muted-foreground">Local storage works offline and skips the Supabase keys below</p>
+            </div>
+
             {/* Supabase URL */}
             <div className="space-y-2">
               <label className="text-sm font-medium">Supabase URL</label>
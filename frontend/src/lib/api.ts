@@ -1,4 +1,5 @@
 import axios from 'axios'
+import type { Card } from '../types'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:51723'
 
@@ -18,6 +19,8 @@ export const boardsApi = {
   update: (id: string, data: { name?: string; description?: string; color?: string; position?: number }) => api.put(`/boards/${id}`, data),
   delete: (id: string) => api.delete(`/boards/${id}`),
   restore: (id: string) => api.post(`/boards/${id}/restore`),
+  archiveMany: (boardIds: string[]) => api.post('/boards/archive', { board_ids: boardIds }),
+  restoreMany: (boardIds: string[]) => api.post('/boards/restore', { board_ids: boardIds }),
 }
 
 // Card API
@@ -51,8 +54,64 @@ export const cardsApi = {
   delete: (id: string) => api.delete(`/cards/${id}`),
   move: (id: string, data: { status?: string; position?: number; board_id?: string }) =>
     api.post(`/cards/${id}/move`, data),
+  search: (params: {
+    q?: string
+    tags?: string[]
+    status?: string[]
+    priority?: number[]
+    deadline_from?: string
+    deadline_to?: string
+    board_id?: string
+    limit?: number
+  }) => api.get('/cards/search', { params, paramsSerializer: { indexes: null } }),
   reorder: (positions: { id: string; position: number; status?: string }[]) =>
     api.post('/cards/reorder', positions),
+  due: (params?: { within?: string; include_overdue?: boolean; limit?: number }) =>
+    api.get<{ now: string; until: string; cards: Card[] }>('/cards/due', { params }),
+  deadlineEvents: () => new EventSource(`${api.defaults.baseURL}/cards/due/events`), // 'due_soon' and 'overdue' events
+  priorityHistory: (id: string, params?: { limit?: number; before?: string }) =>
+    api.get<PriorityHistoryPage>(`/cards/${id}/priority-history`, { params }),
+  compactPriorityHistory: (retainDays?: number) =>
+    api.post('/cards/priority-history/compact', null, { params: { retain_days: retainDays } }),
+}
+
+export interface PriorityHistoryEntry {
+  id: string
+  card_id: string
+  old_priority: number | null
+  new_priority: number
+  reasoning: string
+  model_used: string
+  timestamp: string
+}
+
+export interface PriorityHistoryPage { items: PriorityHistoryEntry[]; next_cursor?: string | null }
+
+// Batch API
+export type BatchOpType =
+  | 'update_card' | 'move_card' | 'delete_card' | 'restore_card'
+  | 'update_board' | 'delete_board' | 'restore_board'
+
+export interface BatchOperation { op: BatchOpType; id: string; data?: Record<string, unknown> }
+
+export const batchApi = {
+  run: (operations: BatchOperation[], atomic = false) => api.post('/batch', { operations, atomic }),
+}
+
+// Sync API (local write journal)
+export interface SyncConflict { card_id: string; kind: string; payload?: Record<string, unknown> | null; server_updated_at?: string | null; detected_at: string }
+export interface SyncStatus { enabled: boolean; pending: number; last_synced_at?: string | null; last_error?: string | null; conflicts: SyncConflict[] }
+
+export const syncApi = {
+  status: () => api.get<SyncStatus>('/sync/status'),
+  flush: () => api.post<SyncStatus>('/sync/flush'),
+}
+
+// Focus API (what to work on next, across boards)
+export interface FocusItem { card: Card; effective_due?: string | null; reasons: string[] }
+
+export const focusApi = {
+  top: (k = 10) => api.get<{ total: number; items: FocusItem[] }>('/focus', { params: { k } }),
 }
 
 // AI API
@@ -61,7 +120,8 @@ export const aiApi = {
   suggest: (cardId: string) => api.post('/ai/suggest', { card_id: cardId }),
   dailyBriefing: () => api.get('/ai/daily-briefing'),
   extractTasks: (text: string, boardId: string) => api.post('/ai/extract-tasks', { text, board_id: boardId }),
-  createExtractedTasks: (tasks: ExtractedTask[]) => api.post('/ai/create-extracted-tasks', { tasks }),
+  createExtractedTasks: (tasks: ExtractedTask[]) =>
+    api.post<{ created_count: number; skipped_duplicates: SkippedDuplicate[] }>('/ai/create-extracted-tasks', { tasks }),
 }
 
 export interface ExtractedTask { // Task extracted by AI from text
@@ -74,10 +134,18 @@ export interface ExtractedTask { // Task extracted by AI from text
   board_id?: string
   status: string
   position: number
+  duplicate_of?: string | null
+  duplicate_of_index?: number | null // Earlier task in the same paste this one repeats
+  duplicate_title?: string | null
+  duplicate_score?: number | null
+  keep_duplicate?: boolean // Create even though it looks like an existing card or an earlier task
 }
 
+export interface SkippedDuplicate { title: string; duplicate_of?: string | null; duplicate_title?: string | null; score?: number | null }
+
 // Settings API
-export interface Settings { supabase_url: string; supabase_key: string; openai_api_key: string; saved?: boolean }
+export type StorageBackend = 'supabase' | 'sqlite'
+export interface Settings { supabase_url: string; supabase_key: string; openai_api_key: string; storage_backend?: StorageBackend; saved?: boolean }
 export const settingsApi = {
   get: () => api.get<Settings>('/settings'),
   save: (data: Settings) => api.post<Settings>('/settings', data),